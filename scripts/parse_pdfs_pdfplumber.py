@@ -4,70 +4,159 @@ Parse CME reports using pdfplumber for better table extraction.
 
 import os
 import re
-import json
+import csv
+import io
+import logging
+import orjson
+import sys
 import pdfplumber
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Optional: psycopg2 for database
 try:
     import psycopg2
+    from psycopg2.extras import execute_values
     HAS_PSYCOPG2 = True
 except ImportError:
     HAS_PSYCOPG2 = False
 
+# Optional: PyMuPDF as a faster (opt-in) text extraction backend
+try:
+    import pymupdf
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
+
+# Section 62 products parsed from the bulletin (code, product header name)
+BULLETIN_PRODUCTS = [
+    ('1OZ', '1 OUNCE GOLD FUTURES'),
+    ('GC', 'COMEX GOLD FUTURES'),
+    ('SI', 'COMEX SILVER FUTURES'),
+    ('SIL', 'MICRO SILVER FUTURES'),
+    ('HG', 'COMEX COPPER FUTURES'),
+    ('PL', 'NYMEX PLATINUM FUTURES'),
+    ('PA', 'NYMEX PALLADIUM FUTURES'),
+    ('ALI', 'COMEX PHYSICAL ALUMINUM FUTURES'),
+    ('MGC', 'MICRO GOLD FUTURES'),
+    ('MHG', 'COMEX MICRO COPPER FUTURES'),
+    ('QI', 'E-MINI SILVER FUTURES'),
+]
+
+# Section 02B products parsed from the volume summary (code, product name)
+VOLUME_PRODUCTS = [
+    ('MGC', 'MICRO GOLD FUTURES'),
+    ('SIL', 'MICRO SILVER FUTURES'),
+    ('GC', 'COMEX GOLD FUTURES'),
+    ('1OZ', '1 OUNCE GOLD FUTURES'),
+    ('SI', 'COMEX SILVER FUTURES'),
+    ('HG', 'COMEX COPPER FUTURES'),
+    ('MHG', 'COMEX MICRO COPPER FUTURES'),
+    ('PL', 'NYMEX PLATINUM FUTURES'),
+    ('QO', 'E-MINI GOLD FUTURES'),
+    ('QI', 'E-MINI SILVER FUTURES'),
+    ('PA', 'NYMEX PALLADIUM FUTURES'),
+    ('ALI', 'COMEX PHYSICAL ALUMINUM FUTURES'),
+    ('QC', 'COMEX E-MINI COPPER FUTURES'),
+]
+
+# Read-only month lookups shared by the header and delivery parsers
+_MONTH_ABBR_TO_NUM = MappingProxyType({
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+})
 
-def _strip_page_headers(text: str) -> str:
-    """Remove repeated page headers/footers from concatenated PDF text.
+_MONTH_LONG_TO_ABBR = MappingProxyType({
+    'JANUARY': 'JAN', 'FEBRUARY': 'FEB', 'MARCH': 'MAR', 'APRIL': 'APR',
+    'MAY': 'MAY', 'JUNE': 'JUN', 'JULY': 'JUL', 'AUGUST': 'AUG',
+    'SEPTEMBER': 'SEP', 'OCTOBER': 'OCT', 'NOVEMBER': 'NOV', 'DECEMBER': 'DEC'
+})
+
+# Thousands separators and the space CME puts between a sign and its digits
+_NUM_CLEAN = str.maketrans('', '', ', ')
+
+# Repeated page headers/footers, matched as one alternation anchored at line start
+_PAGE_HEADER_RE = re.compile(
+    r'^(?:'
+    + '|'.join([
+        r'62\s+METAL\s+FUTURES\s+PRODUCTS\s+62',
+        r'Side\s+\d+\s+Side\s+\d+',
+        r'\d{4}\s+DAILY\s+INFORMATION\s+BULLETIN',
+        r'CME\s+Group,\s+Inc\.',
+        r'20\s+South\s+Wacker',
+        r'Customer\s+Service:',
+        r'PRELIMINARY$',
+        r'PG62\s+BULLETIN',
+        r'THE\s+CME\s+GROUP\s+DAILY\s+BULLETIN',
+        r'PRIVATELY\s+NEGOTIATED',
+        r'TRADING\)\s+MAY\s+BE\s+AFFECTED',
+        r'EXERCISES\s+OR\s+ASSIGNMENTS',
+        r'PRICE\s+INDICATOR\s+KEY',
+        r'R=\s+RECORD\s+VOLUME',
+        r'THE\s+RTH\s+SESSION',
+        r'DAY\'S\s+SETTLEMENT',
+        r'FUTURES\s+PRODUCTS$',
+        r'GLOBEX$',
+        r'GLOBEX\s+OPEN\s+HIGH/LOW',
+        r'&\s+PT\.\s+CHGE',
+        r'NYMEX\s+METAL\s+FUTURES\s+PRODUCTS$',
+        r'THE\s+INFORMATION\s+CONTAINED',
+        r'IS\s+ACCEPTED\s+BY\s+THE\s+USER',
+        r'©\s+Copyright\s+CME',
+        r'METALS\s+CONTRACTS\s+LAST\s+TRADE',
+        r'EXPIRATION:',
+        r'EX-PIT\s+&\s+OTHER',
+        r'DELIVERY-------',
+        r'CASH\s+OR\s+PHY',
+        r'SETTLED\s+TOTALS',
+        r'TO-DATE$',
+    ])
+    + r')',
+    re.ASCII
+)
+
+
+def _iter_page_text(pdf_path: str):
+    """Yield the extracted text of each PDF page in order.
+    
+    Page caches are flushed as soon as a page's text has been taken, so only
+    one page's chars/layout objects are held in memory at a time.
     
-    This strips the '62 METAL FUTURES PRODUCTS 62', 'Side XX', bulletin header,
-    disclaimer, and copyright lines that appear on every page, so product
-    sections that span page boundaries can be parsed as contiguous blocks.
+    Set CME_PDF_BACKEND=pymupdf to extract with PyMuPDF (MuPDF's C parser)
+    instead of pdfplumber. It is much faster but groups text differently, so
+    it is opt-in; pdfplumber remains the default and the fallback when
+    PyMuPDF is not installed.
     """
-    lines = text.split('\n')
-    cleaned = []
-    skip_patterns = [
-        re.compile(r'^62\s+METAL\s+FUTURES\s+PRODUCTS\s+62'),
-        re.compile(r'^Side\s+\d+\s+Side\s+\d+'),
-        re.compile(r'^\d{4}\s+DAILY\s+INFORMATION\s+BULLETIN'),
-        re.compile(r'^CME\s+Group,\s+Inc\.'),
-        re.compile(r'^20\s+South\s+Wacker'),
-        re.compile(r'^Customer\s+Service:'),
-        re.compile(r'^PRELIMINARY$'),
-        re.compile(r'^PG62\s+BULLETIN'),
-        re.compile(r'^THE\s+CME\s+GROUP\s+DAILY\s+BULLETIN'),
-        re.compile(r'^PRIVATELY\s+NEGOTIATED'),
-        re.compile(r'^TRADING\)\s+MAY\s+BE\s+AFFECTED'),
-        re.compile(r'^EXERCISES\s+OR\s+ASSIGNMENTS'),
-        re.compile(r'^PRICE\s+INDICATOR\s+KEY'),
-        re.compile(r'^R=\s+RECORD\s+VOLUME'),
-        re.compile(r'^THE\s+RTH\s+SESSION'),
-        re.compile(r'^DAY\'S\s+SETTLEMENT'),
-        re.compile(r'^FUTURES\s+PRODUCTS$'),
-        re.compile(r'^GLOBEX$'),
-        re.compile(r'^GLOBEX\s+OPEN\s+HIGH/LOW'),
-        re.compile(r'^&\s+PT\.\s+CHGE'),
-        re.compile(r'^NYMEX\s+METAL\s+FUTURES\s+PRODUCTS$'),
-        re.compile(r'^THE\s+INFORMATION\s+CONTAINED'),
-        re.compile(r'^IS\s+ACCEPTED\s+BY\s+THE\s+USER'),
-        re.compile(r'^©\s+Copyright\s+CME'),
-        re.compile(r'^METALS\s+CONTRACTS\s+LAST\s+TRADE'),
-        re.compile(r'^EXPIRATION:'),
-        re.compile(r'^EX-PIT\s+&\s+OTHER'),
-        re.compile(r'^DELIVERY-------'),
-        re.compile(r'^CASH\s+OR\s+PHY'),
-        re.compile(r'^SETTLED\s+TOTALS'),
-        re.compile(r'^TO-DATE$'),
-    ]
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if any(p.match(stripped) for p in skip_patterns):
-            continue
-        cleaned.append(line)
-    return '\n'.join(cleaned)
+    if HAS_PYMUPDF and os.environ.get('CME_PDF_BACKEND', '').lower() == 'pymupdf':
+        with pymupdf.open(pdf_path) as doc:
+            for page in doc:
+                yield page.get_text("text", sort=True)
+        return
+    
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text() or ""
+            page.flush_cache()
+            if hasattr(page, 'get_textmap'):
+                page.get_textmap.cache_clear()
+            yield text
+
+
+def _extract_pdf_text(pdf_path: str, separator: str = "\n") -> str:
+    """Extract the text of all pages, joined once with ``separator``."""
+    return separator.join(_iter_page_text(pdf_path))
+
+
+# Contract month code (e.g. APR26) and single signed price-change token (e.g. -0.00429)
+_MONTH_CODE_RE = re.compile(r'[A-Z]{3}\d{2}', re.ASCII)
+_SIGNED_NUMBER_RE = re.compile(r'[+-][\d.]+', re.ASCII)
 
 
 def _parse_contract_line(line: str) -> dict | None:
@@ -85,7 +174,7 @@ def _parse_contract_line(line: str) -> dict | None:
         return None
     
     # First token must be a month code: 3 uppercase letters + 2 digits
-    if not re.match(r'^[A-Z]{3}\d{2}$', tokens[0]):
+    if not _MONTH_CODE_RE.fullmatch(tokens[0]):
         return None
     
     month = tokens[0]
@@ -123,7 +212,7 @@ def _parse_contract_line(line: str) -> dict | None:
             sign = 1.0 if tokens[idx - 1] == '+' else -1.0
             change = sign * float(tokens[idx])
             idx -= 2
-        elif re.match(r'^[+-][\d.]+$', tokens[idx]):
+        elif _SIGNED_NUMBER_RE.fullmatch(tokens[idx]):
             # Single signed token (e.g. -0.00429)
             change = float(tokens[idx])
             idx -= 1
@@ -145,8 +234,8 @@ def _parse_contract_line(line: str) -> dict | None:
         return None
 
 
-def _parse_total_line(line: str, code: str) -> dict | None:
-    """Parse a TOTAL line for a product.
+def _parse_total_fields(remainder: str) -> dict | None:
+    """Parse the numbers that follow 'TOTAL CODE FUT' on a product's TOTAL line.
     
     Formats observed:
       TOTAL 1OZ FUT 78383 18635 + 132          → vol, OI, oi_change
@@ -154,12 +243,6 @@ def _parse_total_line(line: str, code: str) -> dict | None:
       TOTAL ALA FUT 1455                        → OI only (no volume)
       TOTAL QI FUT 2382 1206 - 1                → vol, OI, oi_change
     """
-    pattern = rf'TOTAL\s+{re.escape(code)}\s+FUT\s+(.*)'
-    match = re.search(pattern, line)
-    if not match:
-        return None
-    
-    remainder = match.group(1).strip()
     tokens = remainder.split()
     
     if not tokens:
@@ -196,14 +279,50 @@ def _parse_total_line(line: str, code: str) -> dict | None:
     }
 
 
+# Bulletin number and trade date share one pass; both sit in the page-1 banner
+_REPORT_HEADER_RE = re.compile(
+    r'BULLETIN\s*#\s*(?P<number>\d+)'
+    r'|(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)[,.]?\s*'
+    r'(?P<month>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(?P<day>\d{1,2}),?\s+(?P<year>\d{4})',
+    re.IGNORECASE | re.ASCII
+)
+_HEADER_SCAN_CHARS = 2000
+
+
+def _parse_report_header(text: str, result: dict) -> None:
+    """Fill any missing bulletin number / date fields of ``result`` from ``text``.
+    
+    Only the first few KB are scanned unless a field is still missing, in
+    which case the whole text is searched.
+    """
+    windows = [text[:_HEADER_SCAN_CHARS]]
+    if len(text) > _HEADER_SCAN_CHARS:
+        windows.append(text)
+    
+    for window in windows:
+        for match in _REPORT_HEADER_RE.finditer(window):
+            if match.group('number') is not None:
+                if result.get('bulletin_number') is None:
+                    result['bulletin_number'] = int(match.group('number'))
+            elif result.get('date') is None:
+                result['date'] = match.group(0).lower()
+                month = _MONTH_ABBR_TO_NUM.get(match.group('month').lower(), 1)
+                day = int(match.group('day'))
+                year = int(match.group('year'))
+                result['parsed_date'] = f"{year:04d}-{month:02d}-{day:02d}"
+            if result.get('bulletin_number') is not None and result.get('date') is not None:
+                return
+
+
 def parse_bulletin_pdf(pdf_path: str) -> dict:
     """Parse Section 62 bulletin for open interest data using pdfplumber.
     
-    Extracts text from all pages, strips page headers, then finds each
-    product section between its header (SYMBOL FUT NAME) and TOTAL line.
-    Contract lines are parsed with a robust right-to-left token approach.
+    Pages are fed one at a time to a BulletinStreamParser, which drops page
+    headers line by line and tracks each product section between its header
+    (SYMBOL FUT NAME) and TOTAL line. Extraction stops as soon as every
+    target product has been closed by its TOTAL line.
     """
-    print(f"[INFO] Parsing bulletin: {pdf_path}")
+    logger.info("[INFO] Parsing bulletin: %s", pdf_path)
     
     result = {
         'bulletin_number': None,
@@ -213,136 +332,159 @@ def parse_bulletin_pdf(pdf_path: str) -> dict:
         'last_updated': datetime.now().isoformat(),
     }
     
-    # 1. Extract full text from all pages
-    with pdfplumber.open(pdf_path) as pdf:
-        full_text = ""
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            full_text += text + "\n"
-    
-    # 2. Parse header metadata
-    bulletin_match = re.search(r'BULLETIN\s*#\s*(\d+)', full_text, re.IGNORECASE)
-    if bulletin_match:
-        result['bulletin_number'] = int(bulletin_match.group(1))
-    
-    date_match = re.search(
-        r'(Mon|Tue|Wed|Thu|Fri|Sat|Sun)[,.]?\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),?\s+(\d{4})',
-        full_text, re.IGNORECASE
-    )
-    if date_match:
-        result['date'] = date_match.group(0).lower()
-        month_map = {
-            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-            'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-        }
-        month = month_map.get(date_match.group(2).lower(), 1)
-        day = int(date_match.group(3))
-        year = int(date_match.group(4))
-        result['parsed_date'] = f"{year:04d}-{month:02d}-{day:02d}"
-    
-    print(f"[INFO] Bulletin #{result.get('bulletin_number')} - {result.get('date')}")
-    
-    # 3. Strip page headers/footers so multi-page products are contiguous
-    cleaned_text = _strip_page_headers(full_text)
-    
-    # 4. Extract each target product
-    products_config = [
-        ('1OZ', '1 OUNCE GOLD FUTURES'),
-        ('GC', 'COMEX GOLD FUTURES'),
-        ('SI', 'COMEX SILVER FUTURES'),
-        ('SIL', 'MICRO SILVER FUTURES'),
-        ('HG', 'COMEX COPPER FUTURES'),
-        ('PL', 'NYMEX PLATINUM FUTURES'),
-        ('PA', 'NYMEX PALLADIUM FUTURES'),
-        ('ALI', 'COMEX PHYSICAL ALUMINUM FUTURES'),
-        ('MGC', 'MICRO GOLD FUTURES'),
-        ('MHG', 'COMEX MICRO COPPER FUTURES'),
-        ('QI', 'E-MINI SILVER FUTURES'),
-    ]
-    
-    for code, name in products_config:
-        product = extract_product_data(cleaned_text, code, name)
-        if product:
-            result['products'].append(product)
-            n = len(product['contracts'])
+    # 1. Stream pages: header metadata from the first pages, products throughout
+    parser = BulletinStreamParser(BULLETIN_PRODUCTS)
+    for page_text in _iter_page_text(pdf_path):
+        if result['bulletin_number'] is None or result['date'] is None:
+            _parse_report_header(page_text, result)
+        parser.feed_page(page_text)
+        if parser.done:
+            break
+    
+    logger.info("[INFO] Bulletin #%s - %s", result.get('bulletin_number'), result.get('date'))
+    
+    # 2. Collect each target product
+    result['products'] = parser.result()
+    if logger.isEnabledFor(logging.INFO):
+        for product in result['products']:
             front = product['contracts'][0] if product['contracts'] else None
             front_info = f", Front={front['month']} @ {front['settle']}" if front else ""
-            print(f"  {code}: {n} contracts, Vol={product['total_volume']:,}, OI={product['total_open_interest']:,}, OI_Chg={product['total_oi_change']:+,}{front_info}")
+            logger.info("  %s: %d contracts, Vol=%s, OI=%s, OI_Chg=%s%s",
+                        product['symbol'], len(product['contracts']),
+                        f"{product['total_volume']:,}", f"{product['total_open_interest']:,}",
+                        f"{product['total_oi_change']:+,}", front_info)
     
     return result
 
 
-def extract_product_data(text: str, code: str, name: str) -> dict | None:
-    """Extract product data including all individual contracts.
-    
-    Finds the section between 'CODE FUT PRODUCT_NAME' and 'TOTAL CODE FUT',
-    then parses every contract line and the total line.
+@lru_cache(maxsize=32)
+def _section_line_re(codes: tuple[str, ...]) -> re.Pattern:
+    """Compiled product header / TOTAL line alternation for a set of codes."""
+    alternation = '|'.join(re.escape(code) for code in sorted(codes, key=len, reverse=True))
+    return re.compile(
+        rf'(?P<total>TOTAL\s+(?P<total_code>{alternation})\s+FUT\s+(?P<total_fields>.*))'
+        rf'|(?<![A-Z0-9])(?P<code>{alternation})\s+FUT\s+(?P<name>.*)',
+        re.ASCII
+    )
+
+
+class BulletinStreamParser:
+    """Incremental Section 62 product parser fed one page of text at a time.
+    
+    The parser is either scanning for a product header ('CODE FUT NAME') or
+    inside a product, collecting contract lines until that product's
+    'TOTAL CODE FUT' line. A header whose name matches the expected product
+    name is preferred; a name-less 'CODE FUT' header is only used while no
+    exact header has been seen for that code. Repeated page headers/footers are skipped per line,
+    so sections that continue across a page break need no pre-cleaning.
     """
-    product = {
-        'symbol': code,
-        'name': name,
-        'contracts': [],
-        'total_volume': 0,
-        'total_open_interest': 0,
-        'total_oi_change': 0,
-    }
-    
-    # Find product section start: "CODE FUT PRODUCT_NAME"
-    header_pattern = rf'{re.escape(code)}\s+FUT\s+{re.escape(name)}'
-    header_match = re.search(header_pattern, text)
-    if not header_match:
-        # Try a more flexible match (name might differ slightly)
-        header_pattern_flex = rf'{re.escape(code)}\s+FUT\s+'
-        header_match = re.search(header_pattern_flex, text)
     
-    if not header_match:
-        return None
-    
-    start_idx = header_match.end()
-    
-    # Find TOTAL line for this product
-    total_pattern = rf'TOTAL\s+{re.escape(code)}\s+FUT\s+'
-    total_match = re.search(total_pattern, text[start_idx:])
-    
-    if not total_match:
-        return None
-    
-    # Extract the section between header and TOTAL
-    section_text = text[start_idx:start_idx + total_match.start()]
-    total_line_start = start_idx + total_match.start()
-    
-    # Find end of TOTAL line
-    total_line_end = text.find('\n', total_line_start)
-    if total_line_end == -1:
-        total_line_end = len(text)
-    total_line = text[total_line_start:total_line_end].strip()
-    
-    # Parse individual contract lines
-    for line in section_text.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-        contract = _parse_contract_line(line)
+    def __init__(self, products: list[tuple[str, str]]):
+        self.products = list(products)
+        self._names = dict(self.products)
+        self._section_re = _section_line_re(tuple(code for code, _ in self.products))
+        self._finished = {}
+        self._exact = set()
+        self._current = None
+        self._seen_months = set()
+    
+    @property
+    def done(self) -> bool:
+        """True once every configured product has reached the TOTAL line
+        after its exact header."""
+        return (self._current is None and len(self._finished) == len(self.products)
+                and len(self._exact) == len(self.products))
+    
+    def feed_page(self, text: str) -> None:
+        # Without an open section, only a 'CODE FUT' header can matter, so
+        # cover, index and disclaimer pages are skipped with one substring test
+        if self._current is None and 'FUT' not in text:
+            return
+        for line in text.split('\n'):
+            self.feed_line(line)
+    
+    def feed_line(self, line: str) -> None:
+        stripped = line.strip()
+        if not stripped or _PAGE_HEADER_RE.match(stripped):
+            return
+        
+        # Contract rows never contain 'FUT'; only header/TOTAL lines need the regex
+        match = self._section_re.search(stripped) if 'FUT' in stripped else None
+        if match:
+            if match.group('total'):
+                code = match.group('total_code')
+                if self._current is not None and self._current['symbol'] == code:
+                    self._finish(match.group('total_fields'))
+            else:
+                code = match.group('code')
+                if code in self._exact:
+                    return
+                if match.group('name').startswith(self._names[code]):
+                    # The exact 'CODE FUT PRODUCT_NAME' header wins over any
+                    # name-less header seen earlier for the same code
+                    self._exact.add(code)
+                    self._start(code)
+                elif code not in self._finished and (
+                        self._current is None or self._current['symbol'] != code):
+                    self._start(code)
+            return
+        
+        if self._current is None:
+            return
+        contract = _parse_contract_line(stripped)
         if contract:
             # Avoid duplicates (same month)
-            if not any(c['month'] == contract['month'] for c in product['contracts']):
-                product['contracts'].append(contract)
-    
-    # Parse TOTAL line
-    totals = _parse_total_line(total_line, code)
-    if totals:
-        product['total_volume'] = totals['total_volume']
-        product['total_open_interest'] = totals['total_open_interest']
-        product['total_oi_change'] = totals['total_oi_change']
-    
-    if product['total_volume'] > 0 or product['total_open_interest'] > 0 or product['contracts']:
-        return product
-    return None
+            if contract['month'] not in self._seen_months:
+                self._seen_months.add(contract['month'])
+                self._current['contracts'].append(contract)
+    
+    def result(self) -> list[dict]:
+        """Completed products with any data, in configured order."""
+        products = []
+        for code, _ in self.products:
+            product = self._finished.get(code)
+            if product and (product['total_volume'] > 0 or product['total_open_interest'] > 0
+                            or product['contracts']):
+                products.append(product)
+        return products
+    
+    def _start(self, code: str) -> None:
+        self._current = {
+            'symbol': code,
+            'name': self._names[code],
+            'contracts': [],
+            'total_volume': 0,
+            'total_open_interest': 0,
+            'total_oi_change': 0,
+        }
+        self._seen_months = set()
+    
+    def _finish(self, total_fields: str) -> None:
+        product = self._current
+        totals = _parse_total_fields(total_fields)
+        if totals:
+            product['total_volume'] = totals['total_volume']
+            product['total_open_interest'] = totals['total_open_interest']
+            product['total_oi_change'] = totals['total_oi_change']
+        self._finished[product['symbol']] = product
+        self._current = None
+
+
+# Delivery report fields
+_BUSINESS_DATE_RE = re.compile(r'BUSINESS DATE[:\s]*(\d{2}/\d{2}/\d{4})', re.ASCII)
+_CONTRACT_MONTH_RE = re.compile(
+    r'(JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER)\s+(\d{4})',
+    re.IGNORECASE | re.ASCII
+)
+_SETTLEMENT_RE = re.compile(r'SETTLEMENT[:\s]*([\d,]+\.?\d*)', re.ASCII)
+_DELIVERY_DATE_RE = re.compile(r'DELIVERY DATE[:\s]*(\d{2}/\d{2}/\d{4})', re.ASCII)
+_DELIVERY_TOTAL_RE = re.compile(r'TOTAL[:\s]*([\d,]+)\s+([\d,]+)', re.ASCII)
+_MONTH_TO_DATE_RE = re.compile(r'MONTH TO DATE[:\s]*([\d,]+)', re.ASCII)
 
 
 def parse_delivery_pdf(pdf_path: str) -> dict:
     """Parse delivery report."""
-    print(f"[INFO] Parsing delivery report: {pdf_path}")
+    logger.info("[INFO] Parsing delivery report: %s", pdf_path)
     
     result = {
         'business_date': None,
@@ -351,14 +493,10 @@ def parse_delivery_pdf(pdf_path: str) -> dict:
         'last_updated': datetime.now().isoformat(),
     }
     
-    with pdfplumber.open(pdf_path) as pdf:
-        full_text = ""
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            full_text += text + "\n\n"
+    full_text = _extract_pdf_text(pdf_path, "\n\n")
     
     # Extract business date
-    date_match = re.search(r'BUSINESS DATE[:\s]*(\d{2}/\d{2}/\d{4})', full_text)
+    date_match = _BUSINESS_DATE_RE.search(full_text)
     if date_match:
         date_str = date_match.group(1)
         result['business_date'] = date_str
@@ -366,28 +504,76 @@ def parse_delivery_pdf(pdf_path: str) -> dict:
         if len(parts) == 3:
             result['parsed_date'] = f"{parts[2]}-{parts[0]}-{parts[1]}"
     
-    print(f"[INFO] Business Date: {result.get('business_date')}")
+    logger.info("[INFO] Business Date: %s", result.get('business_date'))
     
     # Split by CONTRACT sections
-    sections = re.split(r'CONTRACT:', full_text)
+    sections = full_text.split('CONTRACT:')
     
     for section in sections[1:]:
         delivery = parse_delivery_section(section)
         if delivery:
             result['deliveries'].append(delivery)
-            print(f"  {delivery['metal']}: Daily={delivery['daily_issued']:,}, MTD={delivery['month_to_date']:,}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("  %s: Daily=%s, MTD=%s", delivery['metal'],
+                            f"{delivery['daily_issued']:,}", f"{delivery['month_to_date']:,}")
     
     return result
 
 
+# Characters allowed in a firm name token (first token must start with A-Z)
+_FIRM_NAME_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ&,.'")
+
+
+def _is_firm_start(tokens: list[str], i: int) -> bool:
+    """True if tokens[i:] begins a firm row: 3-digit code then C/H origin."""
+    return (i + 1 < len(tokens) and len(tokens[i]) == 3 and tokens[i].isdigit()
+            and tokens[i + 1] in ('C', 'H'))
+
+
+def _scan_firm_rows(line: str):
+    """Yield (code, org, name, issued, stopped) for each firm row on a line.
+    
+    A row is: 3-digit firm code, C/H origin, name tokens, then up to two
+    numbers (issued, stopped). It must end at end of line or where the next
+    firm code starts. Tokens are consumed left to right with no backtracking.
+    """
+    tokens = line.split()
+    n = len(tokens)
+    i = 0
+    while i < n:
+        if not _is_firm_start(tokens, i):
+            i += 1
+            continue
+        
+        j = i + 2
+        name_start = j
+        while j < n and set(tokens[j]) <= _FIRM_NAME_CHARS:
+            j += 1
+        name_end = j
+        if name_end == name_start or not tokens[name_start][0].isalpha():
+            i += 1
+            continue
+        
+        numbers = []
+        while j < n and len(numbers) < 2 and tokens[j].isdigit() and not _is_firm_start(tokens, j):
+            numbers.append(int(tokens[j]))
+            j += 1
+        if j < n and not _is_firm_start(tokens, j):
+            i += 1
+            continue
+        
+        issued = numbers[0] if numbers else 0
+        stopped = numbers[1] if len(numbers) > 1 else 0
+        yield tokens[i], tokens[i + 1], ' '.join(tokens[name_start:name_end]), issued, stopped
+        i = j
+
+
 def parse_delivery_section(section: str) -> dict:
     """Parse a delivery contract section."""
-    name_match = re.search(r'^([^\n]+)', section.strip())
-    if not name_match:
+    contract_name = section.strip().partition('\n')[0].strip()
+    if not contract_name:
         return None
     
-    contract_name = name_match.group(1).strip()
-    
     metal = None
     symbol = None
     if 'GOLD' in contract_name.upper():
@@ -409,52 +595,42 @@ def parse_delivery_section(section: str) -> dict:
         return None
     
     # Contract month
-    month_match = re.search(
-        r'(JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER)\s+(\d{4})',
-        contract_name, re.IGNORECASE
-    )
+    month_match = _CONTRACT_MONTH_RE.search(contract_name)
     contract_month = None
     if month_match:
-        month_map = {
-            'JANUARY': 'JAN', 'FEBRUARY': 'FEB', 'MARCH': 'MAR', 'APRIL': 'APR',
-            'MAY': 'MAY', 'JUNE': 'JUN', 'JULY': 'JUL', 'AUGUST': 'AUG',
-            'SEPTEMBER': 'SEP', 'OCTOBER': 'OCT', 'NOVEMBER': 'NOV', 'DECEMBER': 'DEC'
-        }
-        month = month_map.get(month_match.group(1).upper())
+        month = _MONTH_LONG_TO_ABBR.get(month_match.group(1).upper())
         year = month_match.group(2)[2:]
         contract_month = f"{month}{year}"
     
     # Settlement
-    settle_match = re.search(r'SETTLEMENT[:\s]*([\d,]+\.?\d*)', section)
-    settlement = float(settle_match.group(1).replace(',', '')) if settle_match else None
+    settle_match = _SETTLEMENT_RE.search(section)
+    settlement = float(settle_match.group(1).translate(_NUM_CLEAN)) if settle_match else None
     
     # Delivery date
-    delivery_date_match = re.search(r'DELIVERY DATE[:\s]*(\d{2}/\d{2}/\d{4})', section)
+    delivery_date_match = _DELIVERY_DATE_RE.search(section)
     delivery_date = delivery_date_match.group(1) if delivery_date_match else None
     
     # TOTAL
-    total_match = re.search(r'TOTAL[:\s]*([\d,]+)\s+([\d,]+)', section)
-    daily_issued = int(total_match.group(1).replace(',', '')) if total_match else 0
-    daily_stopped = int(total_match.group(2).replace(',', '')) if total_match else 0
+    total_match = _DELIVERY_TOTAL_RE.search(section)
+    daily_issued = int(total_match.group(1).translate(_NUM_CLEAN)) if total_match else 0
+    daily_stopped = int(total_match.group(2).translate(_NUM_CLEAN)) if total_match else 0
     
     # MONTH TO DATE
-    mtd_match = re.search(r'MONTH TO DATE[:\s]*([\d,]+)', section)
-    month_to_date = int(mtd_match.group(1).replace(',', '')) if mtd_match else 0
+    mtd_match = _MONTH_TO_DATE_RE.search(section)
+    month_to_date = int(mtd_match.group(1).translate(_NUM_CLEAN)) if mtd_match else 0
     
     # Firms
     firms = []
-    firm_pattern = r'(\d{3})\s+([CH])\s+([A-Z][A-Z\s&,.\']+?)\s+(\d+)?\s*(\d+)?(?=\n|\d{3}\s+[CH]|$)'
-    for match in re.finditer(firm_pattern, section):
-        issued = int(match.group(4)) if match.group(4) else 0
-        stopped = int(match.group(5)) if match.group(5) else 0
-        if issued > 0 or stopped > 0:
-            firms.append({
-                'code': match.group(1),
-                'org': match.group(2),
-                'name': match.group(3).strip(),
-                'issued': issued,
-                'stopped': stopped,
-            })
+    for line in section.splitlines():
+        for code, org, name, issued, stopped in _scan_firm_rows(line):
+            if issued > 0 or stopped > 0:
+                firms.append({
+                    'code': code,
+                    'org': org,
+                    'name': name,
+                    'issued': issued,
+                    'stopped': stopped,
+                })
     
     return {
         'metal': metal,
@@ -470,9 +646,27 @@ def parse_delivery_section(section: str) -> dict:
     }
 
 
+@lru_cache(maxsize=32)
+def _volume_lines_re(codes: tuple[str, ...]) -> re.Pattern:
+    """Compiled Section 02B summary-line alternation for a set of product codes.
+    
+    The code must not be preceded by a letter/digit, so GC does not match
+    inside an MGC line.
+    """
+    alternation = '|'.join(re.escape(code) for code in sorted(codes, key=len, reverse=True))
+    return re.compile(
+        rf'(?<![A-Z0-9])(?P<code>{alternation})\s+.*?\s+'
+        r'([\d,]+)\s+([\d,]+)\s+([\d,]+)\s*([+-]?\s*[\d,]+)\s+([\d,]+)\s+([\d,]+)',
+        re.ASCII
+    )
+
+
+_VOLUME_LINES_RE = _volume_lines_re(tuple(code for code, _ in VOLUME_PRODUCTS))
+
+
 def parse_volume_summary_pdf(pdf_path: str) -> dict:
     """Parse Section 02B volume summary."""
-    print(f"[INFO] Parsing volume summary: {pdf_path}")
+    logger.info("[INFO] Parsing volume summary: %s", pdf_path)
     
     result = {
         'bulletin_number': None,
@@ -483,84 +677,68 @@ def parse_volume_summary_pdf(pdf_path: str) -> dict:
         'last_updated': datetime.now().isoformat(),
     }
     
-    with pdfplumber.open(pdf_path) as pdf:
-        full_text = ""
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            full_text += text + "\n\n"
-    
-    # Date
-    date_match = re.search(
-        r'(Mon|Tue|Wed|Thu|Fri|Sat|Sun)[,.]?\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),?\s+(\d{4})',
-        full_text, re.IGNORECASE
-    )
-    if date_match:
-        result['date'] = date_match.group(0).lower()
-        month_map = {
-            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-            'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-        }
-        month = month_map.get(date_match.group(2).lower(), 1)
-        day = int(date_match.group(3))
-        year = int(date_match.group(4))
-        result['parsed_date'] = f"{year:04d}-{month:02d}-{day:02d}"
+    full_text = _extract_pdf_text(pdf_path, "\n\n")
     
-    bulletin_match = re.search(r'BULLETIN\s*#\s*(\d+)', full_text, re.IGNORECASE)
-    if bulletin_match:
-        result['bulletin_number'] = int(bulletin_match.group(1))
+    # Bulletin number + date
+    _parse_report_header(full_text, result)
     
-    print(f"[INFO] Bulletin #{result.get('bulletin_number')} - {result.get('date')}")
+    logger.info("[INFO] Bulletin #%s - %s", result.get('bulletin_number'), result.get('date'))
     
     # Products
-    products_config = [
-        ('MGC', 'MICRO GOLD FUTURES'),
-        ('SIL', 'MICRO SILVER FUTURES'),
-        ('GC', 'COMEX GOLD FUTURES'),
-        ('1OZ', '1 OUNCE GOLD FUTURES'),
-        ('SI', 'COMEX SILVER FUTURES'),
-        ('HG', 'COMEX COPPER FUTURES'),
-        ('MHG', 'COMEX MICRO COPPER FUTURES'),
-        ('PL', 'NYMEX PLATINUM FUTURES'),
-        ('QO', 'E-MINI GOLD FUTURES'),
-        ('QI', 'E-MINI SILVER FUTURES'),
-        ('PA', 'NYMEX PALLADIUM FUTURES'),
-        ('ALI', 'COMEX PHYSICAL ALUMINUM FUTURES'),
-        ('QC', 'COMEX E-MINI COPPER FUTURES'),
-    ]
-    
-    for code, name in products_config:
-        # Pattern for volume summary line
-        pattern = rf'{code}\s+.*?\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s*([+-]?\s*[\d,]+)\s+([\d,]+)\s+([\d,]+)'
-        match = re.search(pattern, full_text)
+    # One pass over the text for all products; the first line per code wins
+    matches = {}
+    for match in _VOLUME_LINES_RE.finditer(full_text):
+        matches.setdefault(match.group('code'), match)
+        if len(matches) == len(VOLUME_PRODUCTS):
+            break
+    
+    for code, name in VOLUME_PRODUCTS:
+        match = matches.get(code)
         
         if match:
             product = {
                 'symbol': code,
                 'name': name,
-                'globex_volume': int(match.group(1).replace(',', '')),
-                'total_volume': int(match.group(2).replace(',', '')),
-                'open_interest': int(match.group(3).replace(',', '')),
-                'oi_change': int(match.group(4).replace(' ', '').replace(',', '')),
-                'yoy_volume': int(match.group(5).replace(',', '')),
-                'yoy_open_interest': int(match.group(6).replace(',', '')),
+                'globex_volume': int(match.group(2).translate(_NUM_CLEAN)),
+                'total_volume': int(match.group(3).translate(_NUM_CLEAN)),
+                'open_interest': int(match.group(4).translate(_NUM_CLEAN)),
+                'oi_change': int(match.group(5).translate(_NUM_CLEAN)),
+                'yoy_volume': int(match.group(6).translate(_NUM_CLEAN)),
+                'yoy_open_interest': int(match.group(7).translate(_NUM_CLEAN)),
             }
             result['products'].append(product)
-            print(f"  {code}: Vol={product['total_volume']:,}, OI={product['open_interest']:,}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("  %s: Vol=%s, OI=%s", code,
+                            f"{product['total_volume']:,}", f"{product['open_interest']:,}")
     
     return result
 
 
-def sync_to_database(bulletin_data: dict, delivery_data: dict, volume_data: dict, database_url: str):
-    """Sync data to database."""
-    if not HAS_PSYCOPG2 or not database_url:
-        print("[INFO] Database sync skipped")
-        return
+def _bulletin_row(parsed_date: str, product: dict) -> tuple:
+    """bulletin_snapshots column values for one parsed product."""
+    front = product['contracts'][0] if product.get('contracts') else None
+    return (
+        parsed_date, product['symbol'], product['name'],
+        product['total_volume'], product['total_open_interest'],
+        product['total_oi_change'],
+        front['month'] if front else None,
+        front['settle'] if front else None,
+        front['change'] if front else None,
+    )
+
+
+def _ensure_tables(conn) -> None:
+    """Create the snapshot tables and index if they are missing.
     
-    try:
-        conn = psycopg2.connect(database_url)
-        cur = conn.cursor()
-        
-        # Ensure tables exist
+    A single catalog lookup decides whether any DDL is needed.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT to_regclass('bulletin_snapshots'), to_regclass('delivery_snapshots'),
+               to_regclass('open_interest_snapshots'), to_regclass('idx_oi_snapshots_symbol_date')
+    """)
+    if None in cur.fetchone():
+        # All DDL goes in one statement batch: a single round-trip to the server
         cur.execute("""
             CREATE TABLE IF NOT EXISTS bulletin_snapshots (
                 id SERIAL PRIMARY KEY,
@@ -575,10 +753,8 @@ def sync_to_database(bulletin_data: dict, delivery_data: dict, volume_data: dict
                 front_month_change DECIMAL(15, 4),
                 created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
                 UNIQUE(date, symbol)
-            )
-        """)
-        
-        cur.execute("""
+            );
+            
             CREATE TABLE IF NOT EXISTS delivery_snapshots (
                 id SERIAL PRIMARY KEY,
                 metal VARCHAR(50) NOT NULL,
@@ -591,11 +767,9 @@ def sync_to_database(bulletin_data: dict, delivery_data: dict, volume_data: dict
                 month_to_date INTEGER DEFAULT 0,
                 created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
                 UNIQUE(metal, report_date)
-            )
-        """)
-        
-        # Create open_interest_snapshots table (used for previous day comparison in Market Activity)
-        cur.execute("""
+            );
+            
+            -- open_interest_snapshots is used for previous day comparison in Market Activity
             CREATE TABLE IF NOT EXISTS open_interest_snapshots (
                 id SERIAL PRIMARY KEY,
                 symbol VARCHAR(20) NOT NULL,
@@ -606,28 +780,42 @@ def sync_to_database(bulletin_data: dict, delivery_data: dict, volume_data: dict
                 settlement_price DECIMAL(15, 6),
                 created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
                 UNIQUE(symbol, report_date)
-            )
-        """)
-        
-        # Create index for faster queries on open_interest_snapshots
-        cur.execute("""
+            );
+            
             CREATE INDEX IF NOT EXISTS idx_oi_snapshots_symbol_date 
-            ON open_interest_snapshots(symbol, report_date DESC)
+            ON open_interest_snapshots(symbol, report_date DESC);
         """)
+    
+    conn.commit()
+    cur.close()
+
+
+def sync_to_database(bulletin_data: dict, delivery_data: dict, volume_data: dict, database_url: str):
+    """Sync data to database."""
+    if not HAS_PSYCOPG2 or not database_url:
+        logger.info("[INFO] Database sync skipped")
+        return
+    
+    conn = None
+    try:
+        conn = psycopg2.connect(database_url)
+        cur = conn.cursor()
         
-        conn.commit()
+        _ensure_tables(conn)
         
-        # Sync bulletin
+        # Sync bulletin (one statement per table; rows keyed by the conflict
+        # target so a repeated key keeps the last value, as per-row upserts did)
         if bulletin_data and bulletin_data.get('parsed_date'):
             parsed_date = bulletin_data['parsed_date']
-            saved = 0
+            rows = {}
             for product in bulletin_data.get('products', []):
-                front = product['contracts'][0] if product.get('contracts') else None
-                cur.execute("""
+                rows[product['symbol']] = _bulletin_row(parsed_date, product)
+            if rows:
+                execute_values(cur, """
                     INSERT INTO bulletin_snapshots (
                         date, symbol, product_name, total_volume, total_open_interest,
                         total_oi_change, front_month, front_month_settle, front_month_change
-                    ) VALUES (%s::date, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ) VALUES %s
                     ON CONFLICT (date, symbol) DO UPDATE SET
                         total_volume = EXCLUDED.total_volume,
                         total_open_interest = EXCLUDED.total_open_interest,
@@ -636,27 +824,27 @@ def sync_to_database(bulletin_data: dict, delivery_data: dict, volume_data: dict
                         front_month_settle = EXCLUDED.front_month_settle,
                         front_month_change = EXCLUDED.front_month_change,
                         created_at = CURRENT_TIMESTAMP
-                """, (
-                    parsed_date, product['symbol'], product['name'],
-                    product['total_volume'], product['total_open_interest'],
-                    product['total_oi_change'],
-                    front['month'] if front else None,
-                    front['settle'] if front else None,
-                    front['change'] if front else None,
-                ))
-                saved += 1
-            print(f"[OK] Synced {saved} bulletin products to bulletin_snapshots")
+                """, list(rows.values()),
+                    template="(%s::date, %s, %s, %s, %s, %s, %s, %s, %s)", page_size=500)
+            logger.info("[OK] Synced %d bulletin products to bulletin_snapshots", len(rows))
         
         # Sync delivery
         if delivery_data and delivery_data.get('parsed_date'):
             parsed_date = delivery_data['parsed_date']
-            saved = 0
+            rows = {}
             for delivery in delivery_data.get('deliveries', []):
-                cur.execute("""
+                rows[delivery['metal']] = (
+                    delivery['metal'], delivery['symbol'], parsed_date,
+                    delivery['contract_month'], delivery['settlement'],
+                    delivery['daily_issued'], delivery['daily_stopped'],
+                    delivery['month_to_date'],
+                )
+            if rows:
+                execute_values(cur, """
                     INSERT INTO delivery_snapshots (
                         metal, symbol, report_date, contract_month,
                         settlement_price, daily_issued, daily_stopped, month_to_date
-                    ) VALUES (%s, %s, %s::date, %s, %s, %s, %s, %s)
+                    ) VALUES %s
                     ON CONFLICT (metal, report_date) DO UPDATE SET
                         symbol = EXCLUDED.symbol,
                         contract_month = EXCLUDED.contract_month,
@@ -665,46 +853,207 @@ def sync_to_database(bulletin_data: dict, delivery_data: dict, volume_data: dict
                         daily_stopped = EXCLUDED.daily_stopped,
                         month_to_date = EXCLUDED.month_to_date,
                         created_at = CURRENT_TIMESTAMP
-                """, (
-                    delivery['metal'], delivery['symbol'], parsed_date,
-                    delivery['contract_month'], delivery['settlement'],
-                    delivery['daily_issued'], delivery['daily_stopped'],
-                    delivery['month_to_date'],
-                ))
-                saved += 1
-            print(f"[OK] Synced {saved} delivery records to delivery_snapshots")
+                """, list(rows.values()),
+                    template="(%s, %s, %s::date, %s, %s, %s, %s, %s)", page_size=500)
+            logger.info("[OK] Synced %d delivery records to delivery_snapshots", len(rows))
         
         # Sync volume summary to open_interest_snapshots (critical for Market Activity comparison)
         if volume_data and volume_data.get('parsed_date'):
             parsed_date = volume_data['parsed_date']
-            saved = 0
+            rows = {}
             for product in volume_data.get('products', []):
-                cur.execute("""
+                rows[product['symbol']] = (
+                    product['symbol'], parsed_date,
+                    product['open_interest'], product['oi_change'],
+                    product['total_volume'],
+                )
+            if rows:
+                execute_values(cur, """
                     INSERT INTO open_interest_snapshots (
                         symbol, report_date, open_interest, oi_change, total_volume
-                    ) VALUES (%s, %s::date, %s, %s, %s)
+                    ) VALUES %s
                     ON CONFLICT (symbol, report_date) DO UPDATE SET
                         open_interest = EXCLUDED.open_interest,
                         oi_change = EXCLUDED.oi_change,
                         total_volume = EXCLUDED.total_volume,
                         created_at = CURRENT_TIMESTAMP
-                """, (
-                    product['symbol'], parsed_date,
-                    product['open_interest'], product['oi_change'],
-                    product['total_volume'],
-                ))
-                saved += 1
-            print(f"[OK] Synced {saved} products to open_interest_snapshots")
+                """, list(rows.values()),
+                    template="(%s, %s::date, %s, %s, %s)", page_size=500)
+            logger.info("[OK] Synced %d products to open_interest_snapshots", len(rows))
         
         conn.commit()
         cur.close()
-        conn.close()
         
     except Exception as e:
-        print(f"[ERROR] Database error: {e}")
+        if conn:
+            conn.rollback()
+        logger.error("[ERROR] Database error: %s", e)
+    finally:
+        if conn:
+            conn.close()
+
+
+def write_json(path, data) -> None:
+    """
+    Write ``data`` as 2-space indented UTF-8 JSON.
+    
+    The JSON goes to a temporary file beside ``path`` that then replaces
+    it, so the dashboard never reads a half-written file.
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data, default=str,
+                             option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+    os.replace(tmp_path, path)
+
+
+def sync_bulletins_bulk(bulletins, database_url: str) -> int:
+    """Bulk-load many parsed bulletins into bulletin_snapshots (backfills).
+    
+    All rows are streamed into a temporary table with a single COPY and then
+    merged with one INSERT ... SELECT ... ON CONFLICT, instead of one upsert
+    statement per bulletin. Returns the number of rows loaded.
+    """
+    if not HAS_PSYCOPG2 or not database_url:
+        logger.info("[INFO] Database sync skipped")
+        return 0
+    
+    # Later bulletins win for a repeated (date, symbol), like sequential upserts
+    rows = {}
+    for bulletin in bulletins:
+        if not bulletin or not bulletin.get('parsed_date'):
+            continue
+        parsed_date = bulletin['parsed_date']
+        for product in bulletin.get('products', []):
+            rows[(parsed_date, product['symbol'])] = _bulletin_row(parsed_date, product)
+    
+    if not rows:
+        logger.info("[INFO] No bulletin rows to load")
+        return 0
+    
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows.values())
+    buf.seek(0)
+    
+    conn = None
+    try:
+        conn = psycopg2.connect(database_url)
+        _ensure_tables(conn)
+        cur = conn.cursor()
+        
+        cur.execute("""
+            CREATE TEMP TABLE tmp_bulletin_snapshots ON COMMIT DROP AS
+            SELECT date, symbol, product_name, total_volume, total_open_interest,
+                   total_oi_change, front_month, front_month_settle, front_month_change
+            FROM bulletin_snapshots WITH NO DATA
+        """)
+        cur.copy_expert("""
+            COPY tmp_bulletin_snapshots (
+                date, symbol, product_name, total_volume, total_open_interest,
+                total_oi_change, front_month, front_month_settle, front_month_change
+            ) FROM STDIN WITH CSV
+        """, buf)
+        cur.execute("""
+            INSERT INTO bulletin_snapshots (
+                date, symbol, product_name, total_volume, total_open_interest,
+                total_oi_change, front_month, front_month_settle, front_month_change
+            )
+            SELECT date, symbol, product_name, total_volume, total_open_interest,
+                   total_oi_change, front_month, front_month_settle, front_month_change
+            FROM tmp_bulletin_snapshots
+            ON CONFLICT (date, symbol) DO UPDATE SET
+                total_volume = EXCLUDED.total_volume,
+                total_open_interest = EXCLUDED.total_open_interest,
+                total_oi_change = EXCLUDED.total_oi_change,
+                front_month = EXCLUDED.front_month,
+                front_month_settle = EXCLUDED.front_month_settle,
+                front_month_change = EXCLUDED.front_month_change,
+                created_at = CURRENT_TIMESTAMP
+        """)
+        conn.commit()
+        cur.close()
+        logger.info("[OK] Bulk loaded %d bulletin rows into bulletin_snapshots", len(rows))
+        return len(rows)
+    
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        logger.error("[ERROR] Database error: %s", e)
+        return 0
+    finally:
+        if conn:
+            conn.close()
+
+
+# Product fields a parsed Section 62 bulletin carries for bulletin_snapshots
+_BULLETIN_PRODUCT_FIELDS = ('symbol', 'name', 'total_volume', 'total_open_interest', 'total_oi_change')
+
+
+def _is_bulletin(data) -> bool:
+    """True if ``data`` looks like parse_bulletin_pdf output (not another report's JSON)."""
+    if not isinstance(data, dict) or not data.get('parsed_date'):
+        return False
+    products = data.get('products')
+    return isinstance(products, list) and all(
+        isinstance(product, dict) and all(field in product for field in _BULLETIN_PRODUCT_FIELDS)
+        for product in products
+    )
+
+
+def backfill_bulletins(directory: Path, database_url: str) -> int:
+    """Parse every Section 62 bulletin PDF / saved bulletin JSON in ``directory``
+    and bulk-load them.
+    
+    Only ``Section62*.pdf`` and ``bulletin*.json`` files are picked up, and
+    PDFs are parsed in separate processes. A file that fails to parse, or
+    JSON that is not a bulletin, is skipped with a warning. Bulletins are
+    loaded in date order, so the newest parse of a given date wins. Returns
+    the number of rows loaded.
+    """
+    pdf_paths = sorted(directory.glob('Section62*.pdf'))
+    json_paths = sorted(directory.glob('bulletin*.json'))
+    logger.info("[INFO] Backfilling from %s: %d PDFs, %d JSON files",
+                directory, len(pdf_paths), len(json_paths))
+    
+    parsed = []
+    for json_path in json_paths:
+        try:
+            parsed.append((json_path, orjson.loads(json_path.read_bytes())))
+        except (OSError, ValueError) as e:
+            logger.warning("[WARNING] Skipping %s: %s", json_path.name, e)
+    
+    if pdf_paths:
+        with ProcessPoolExecutor(initializer=_configure_logging) as executor:
+            futures = {pdf_path: executor.submit(parse_bulletin_pdf, str(pdf_path)) for pdf_path in pdf_paths}
+            for pdf_path, future in futures.items():
+                try:
+                    parsed.append((pdf_path, future.result()))
+                except Exception as e:
+                    logger.warning("[WARNING] Skipping %s: %s", pdf_path.name, e)
+    
+    bulletins = []
+    for path, data in parsed:
+        if _is_bulletin(data):
+            bulletins.append(data)
+        else:
+            logger.warning("[WARNING] Skipping %s: not a parsed bulletin", path.name)
+    
+    bulletins.sort(key=lambda b: (b['parsed_date'], b.get('last_updated') or ''))
+    return sync_bulletins_bulk(bulletins, database_url)
+
+
+def _configure_logging() -> None:
+    """Send this module's log records to stdout as plain messages.
+    
+    Also used as the process-pool initializer, so worker processes log the
+    same way when they are spawned rather than forked.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
 
 
 def main():
+    _configure_logging()
+    
     print("=" * 70)
     print("  CME Reports Parser (pdfplumber) - February 4th, 2026")
     print("=" * 70)
@@ -715,58 +1064,64 @@ def main():
     load_dotenv(project_root / '.env')
     database_url = os.environ.get('DATABASE_URL')
     
-    bulletin_data = None
-    delivery_data = None
-    volume_data = None
-    
     # Data directory (check data/ subfolder first, then project root)
     data_dir = project_root / 'data'
     
-    # 1. Parse bulletin
-    bulletin_pdf = data_dir / 'Section62_Metals_Futures_Products.pdf'
-    if not bulletin_pdf.exists():
-        bulletin_pdf = project_root / 'Section62_Metals_Futures_Products.pdf'
-    if bulletin_pdf.exists():
-        bulletin_data = parse_bulletin_pdf(str(bulletin_pdf))
-        with open(project_root / 'public' / 'bulletin.json', 'w') as f:
-            json.dump(bulletin_data, f, indent=2)
-        print(f"[OK] Saved bulletin.json")
-    else:
-        print(f"[WARNING] Not found: {bulletin_pdf}")
+    # --backfill <dir> bulk-loads a directory of historical bulletins instead
+    args = sys.argv[1:]
+    if '--backfill' in args:
+        index = args.index('--backfill')
+        if index + 1 >= len(args) or args[index + 1].startswith('--'):
+            logger.error("[ERROR] Usage: --backfill <directory of Section62*.pdf / bulletin*.json>")
+            sys.exit(1)
+        backfill_dir = Path(args[index + 1])
+        if not backfill_dir.is_dir():
+            logger.error("[ERROR] Not a directory: %s", backfill_dir)
+            sys.exit(1)
+        backfill_bulletins(backfill_dir, database_url)
+        return
     
-    print()
+    reports = [
+        ('bulletin', parse_bulletin_pdf, 'Section62_Metals_Futures_Products.pdf', 'bulletin.json'),
+        ('delivery', parse_delivery_pdf, 'MetalsIssuesAndStopsReport.pdf', 'delivery.json'),
+        ('volume', parse_volume_summary_pdf,
+         'Section02B_Summary_Volume_And_Open_Interest_Metals_Futures_And_Options.pdf', 'volume_summary.json'),
+    ]
     
-    # 2. Parse delivery
-    delivery_pdf = data_dir / 'MetalsIssuesAndStopsReport.pdf'
-    if not delivery_pdf.exists():
-        delivery_pdf = project_root / 'MetalsIssuesAndStopsReport.pdf'
-    if delivery_pdf.exists():
-        delivery_data = parse_delivery_pdf(str(delivery_pdf))
-        with open(project_root / 'public' / 'delivery.json', 'w') as f:
-            json.dump(delivery_data, f, indent=2)
-        print(f"[OK] Saved delivery.json")
+    jobs = []
+    for key, parse_fn, pdf_name, json_name in reports:
+        pdf_path = data_dir / pdf_name
+        if not pdf_path.exists():
+            pdf_path = project_root / pdf_name
+        if pdf_path.exists():
+            jobs.append((key, parse_fn, pdf_path, json_name))
+        else:
+            logger.warning("[WARNING] Not found: %s", pdf_path)
+    
+    # 1-3. Parse the reports. They are independent files, so when there is
+    # more than one, parse them in separate processes (extraction is
+    # CPU-bound pure Python).
+    if len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=len(jobs), initializer=_configure_logging) as executor:
+            futures = {key: executor.submit(parse_fn, str(pdf_path)) for key, parse_fn, pdf_path, _ in jobs}
+            results = {key: future.result() for key, future in futures.items()}
     else:
-        print(f"[WARNING] Not found: {delivery_pdf}")
+        results = {key: parse_fn(str(pdf_path)) for key, parse_fn, pdf_path, _ in jobs}
     
     print()
+    for key, _, _, json_name in jobs:
+        write_json(project_root / 'public' / json_name, results[key])
+        logger.info("[OK] Saved %s", json_name)
     
-    # 3. Parse volume summary
-    volume_pdf = data_dir / 'Section02B_Summary_Volume_And_Open_Interest_Metals_Futures_And_Options.pdf'
-    if not volume_pdf.exists():
-        volume_pdf = project_root / 'Section02B_Summary_Volume_And_Open_Interest_Metals_Futures_And_Options.pdf'
-    if volume_pdf.exists():
-        volume_data = parse_volume_summary_pdf(str(volume_pdf))
-        with open(project_root / 'public' / 'volume_summary.json', 'w') as f:
-            json.dump(volume_data, f, indent=2)
-        print(f"[OK] Saved volume_summary.json")
-    else:
-        print(f"[WARNING] Not found: {volume_pdf}")
+    bulletin_data = results.get('bulletin')
+    delivery_data = results.get('delivery')
+    volume_data = results.get('volume')
     
     print()
     
     # 4. Sync to database
     if database_url:
-        print("[INFO] Syncing to database...")
+        logger.info("[INFO] Syncing to database...")
         sync_to_database(bulletin_data, delivery_data, volume_data, database_url)
     
     print()
@@ -5,44 +5,121 @@ Extracts overall volume, open interest, and year-over-year comparisons for all m
 
 import os
 import re
-import json
+import orjson
 import subprocess
+import tempfile
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+
+# Compiled once at import; these run per line and per report
+_BULLETIN_RE = re.compile(r'BULLETIN\s*#\s*(\d+)', re.IGNORECASE)
+_DATE_RE = re.compile(
+    r'(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)[,.]?\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),?\s+(\d{4})',
+    re.IGNORECASE
+)
+_MONTHS = MappingProxyType({
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+})
+# The header sits at the top of the report; only search further if it is not there
+_HEADER_SCAN_CHARS = 2048
+_WS_RE = re.compile(r'\s+')
+# (pattern, key, anchor): each pattern starts with its literal anchor, and the
+# streaming parser only runs a pattern when the previous line contains it
+_TOTALS_RES = (
+    (re.compile(r'FUTURES & OPTIONS -\s*\n\s*METALS\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s*([+-])\s*([\d,]+)\s+([\d,]+)\s+([\d,]+)', re.MULTILINE | re.IGNORECASE), 'futures_options', 'FUTURES & OPTIONS -'),
+    (re.compile(r'FUTURES ONLY -\s*\n\s*METALS\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s*([+-])\s*([\d,]+)\s+([\d,]+)\s+([\d,]+)', re.MULTILINE | re.IGNORECASE), 'futures_only', 'FUTURES ONLY -'),
+    (re.compile(r'OPTIONS ONLY -\s*\n\s*METALS\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s*([+-])\s*([\d,]+)\s+([\d,]+)\s+([\d,]+)', re.MULTILINE | re.IGNORECASE), 'options_only', 'OPTIONS ONLY -'),
+)
+
+# Product symbols to look for in the METALS section
+_PRODUCT_NAMES = {
+    'MGC': 'MICRO GOLD FUTURES',
+    'GC': 'COMEX GOLD FUTURES',
+    'SIL': 'MICRO SILVER FUTURES',
+    '1OZ': '1 OUNCE GOLD FUTURES',
+    'HG': 'COMEX COPPER FUTURES',
+    'SI': 'COMEX SILVER FUTURES',
+    'MHG': 'COMEX MICRO COPPER FUTURES',
+    'PL': 'NYMEX PLATINUM FUTURES',
+    'QO': 'E-MINI GOLD FUTURES',
+    'PA': 'NYMEX PALLADIUM FUTURES',
+    'QI': 'E-MINI SILVER FUTURES',
+    'ALI': 'COMEX PHYSICAL ALUMINUM FUTURES',
+    'HGS': 'COMEX COPPER SWAP FUTURES',
+    'QC': 'COMEX E-MINI COPPER FUTURES',
+}
+# Longest symbols first so HG cannot shadow HGS; the trailing space anchors the symbol
+_SYMBOL_RE = re.compile(
+    '(' + '|'.join(re.escape(sym) for sym in sorted(_PRODUCT_NAMES, key=len, reverse=True)) + ') '
+)
 
 
 def load_env():
-    """Load environment variables from .env file."""
+    """Load environment variables from .env file (once per process)."""
+    if os.environ.get('_METALSTATS_ENV_LOADED'):
+        return
+    
     env_paths = [
         Path(__file__).parent / '.env',
         Path(__file__).parent.parent / '.env',
     ]
     for env_file in env_paths:
         if env_file.exists():
-            with open(env_file) as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        os.environ[key] = value
+            for line in env_file.read_text().splitlines():
+                line = line.strip()
+                key, sep, value = line.partition('=')
+                if sep and not line.startswith('#'):
+                    os.environ[key.strip()] = value.strip()
             print(f"[INFO] Loaded environment from {env_file}")
             break
+    
+    os.environ['_METALSTATS_ENV_LOADED'] = '1'
 
 
-def extract_pdf_text(pdf_path: str) -> str:
-    """Extract text from PDF using pdftotext with layout preservation."""
-    try:
-        result = subprocess.run(
-            ['pdftotext', '-layout', pdf_path, '-'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout
-    except FileNotFoundError:
-        raise RuntimeError("pdftotext not found. Install poppler: brew install poppler")
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"PDF text extraction failed: {e.stderr}")
+def iter_pdf_lines(pdf_path: str):
+    """Yield pdftotext -layout output line by line, as raw bytes, as it is produced.
+    
+    Closing the generator early stops pdftotext, so callers that have what
+    they need do not wait for (or buffer) the rest of the document. Lines are
+    left undecoded so callers only pay for decoding the lines they parse.
+    """
+    # stderr goes to a temp file so a chatty pdftotext cannot block on a full pipe
+    with tempfile.TemporaryFile(mode='w+') as err:
+        try:
+            proc = subprocess.Popen(
+                ['pdftotext', '-layout', pdf_path, '-'],
+                stdout=subprocess.PIPE,
+                stderr=err,
+                bufsize=-1
+            )
+        except FileNotFoundError:
+            raise RuntimeError("pdftotext not found. Install poppler: brew install poppler")
+        
+        finished = False
+        try:
+            for line in proc.stdout:
+                yield line
+            finished = True
+        finally:
+            if not finished:
+                proc.terminate()
+            proc.stdout.close()
+            proc.wait()
+        
+        if proc.returncode != 0:
+            err.seek(0)
+            raise RuntimeError(f"PDF text extraction failed: {err.read()}")
+
+
+def _search_header(pattern: re.Pattern, text: str):
+    """Search the top of the report first, falling back to the whole text."""
+    match = pattern.search(text, 0, _HEADER_SCAN_CHARS)
+    # A match running into the window edge may be cut short (e.g. a truncated number)
+    if match and match.end() < _HEADER_SCAN_CHARS:
+        return match
+    return pattern.search(text)
 
 
 def parse_header(text: str) -> dict:
@@ -54,24 +131,17 @@ def parse_header(text: str) -> dict:
     }
     
     # Find bulletin number: "BULLETIN # 19@"
-    bulletin_match = re.search(r'BULLETIN\s*#\s*(\d+)', text, re.IGNORECASE)
+    bulletin_match = _search_header(_BULLETIN_RE, text)
     if bulletin_match:
         result['bulletin_number'] = int(bulletin_match.group(1))
     
     # Find date: "Thu, Jan 29, 2026"
-    date_match = re.search(
-        r'(Mon|Tue|Wed|Thu|Fri|Sat|Sun)[,.]?\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),?\s+(\d{4})',
-        text, re.IGNORECASE
-    )
+    date_match = _search_header(_DATE_RE, text)
     if date_match:
         result['date'] = date_match.group(0).lower()
-        month_map = {
-            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-            'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-        }
-        month = month_map.get(date_match.group(2).lower(), 1)
-        day = int(date_match.group(3))
-        year = int(date_match.group(4))
+        month = _MONTHS.get(date_match.group(1).lower(), 1)
+        day = int(date_match.group(2))
+        year = int(date_match.group(3))
         result['parsed_date'] = f"{year:04d}-{month:02d}-{day:02d}"
     
     return result
@@ -96,123 +166,69 @@ def parse_change(s: str) -> int:
         return 0
     s = s.strip()
     # Handle formats like "+      1571622" or "-       31113"
-    s = re.sub(r'\s+', '', s)
+    s = _WS_RE.sub('', s)
     try:
         return int(float(s))
     except ValueError:
         return 0
 
 
-def parse_metals_summary(text: str) -> list:
-    """Parse the METALS FUTURES & OPTIONS section using position-based parsing."""
-    products = []
+def _parse_product_line(line: str) -> dict | None:
+    """Parse one METALS section line into a product dict, or None if it is not a product row."""
+    # Dispatch on the leading product symbol with one anchored match
+    symbol_match = _SYMBOL_RE.match(line.strip())
+    if not symbol_match:
+        return None
+    symbol = symbol_match.group(1)
+    name = _PRODUCT_NAMES[symbol]
     
-    # Find the METALS FUTURES & OPTIONS section
-    section_match = re.search(r'METALS FUTURES & OPTIONS', text)
-    if not section_match:
-        print("[WARNING] Could not find METALS FUTURES & OPTIONS section")
-        return products
-    
-    section_start = section_match.end()
-    
-    # Find the end of the metals section
-    section_end = text.find('VOLUME AND OPEN INTEREST "RECORDS"', section_start)
-    if section_end == -1:
-        section_end = len(text)
-    
-    section = text[section_start:section_end]
-    
-    # Product symbols to look for
-    product_configs = {
-        'MGC': 'MICRO GOLD FUTURES',
-        'GC': 'COMEX GOLD FUTURES',
-        'SIL': 'MICRO SILVER FUTURES',
-        '1OZ': '1 OUNCE GOLD FUTURES',
-        'HG': 'COMEX COPPER FUTURES',
-        'SI': 'COMEX SILVER FUTURES',
-        'MHG': 'COMEX MICRO COPPER FUTURES',
-        'PL': 'NYMEX PLATINUM FUTURES',
-        'QO': 'E-MINI GOLD FUTURES',
-        'PA': 'NYMEX PALLADIUM FUTURES',
-        'QI': 'E-MINI SILVER FUTURES',
-        'ALI': 'COMEX PHYSICAL ALUMINUM FUTURES',
-        'HGS': 'COMEX COPPER SWAP FUTURES',
-        'QC': 'COMEX E-MINI COPPER FUTURES',
-    }
+    # Example lines:
+    # MGC MICRO GOLD FUTURES                        1577286                               1577286            58501    -        18559        126712            30723
+    # GC COMEX GOLD FUTURES                          640763                      11710     652473           458641    -         6482        247938           576557
     
-    for line in section.split('\n'):
-        line_stripped = line.strip()
-        if not line_stripped:
+    # Tokenize once: the OI change sign is preceded by 3-5 volume/OI columns
+    # (globex, optional outcry/pnt columns, total volume, open interest) and
+    # followed by the OI change, YoY volume and YoY OI
+    tokens = line.replace(',', '').split()
+    for sign_idx, token in enumerate(tokens):
+        if token[0] not in '+-':
             continue
         
-        # Check if line starts with a known product symbol
-        for symbol, name in product_configs.items():
-            if line_stripped.startswith(symbol + ' '):
-                # Parse based on pattern matching
-                # Example lines:
-                # MGC MICRO GOLD FUTURES                        1577286                               1577286            58501    -        18559        126712            30723
-                # GC COMEX GOLD FUTURES                          640763                      11710     652473           458641    -         6482        247938           576557
-                
-                # Use a more robust regex to extract the key numbers
-                # Pattern looks for: product info, then numbers with optional +/- signs
-                match = re.search(
-                    r'(\d[\d,]*)\s+'          # First number (globex vol)
-                    r'(?:(\d[\d,]*)\s+)?'     # Optional second number (outcry/pnt)
-                    r'(?:(\d[\d,]*)\s+)?'     # Optional third number  
-                    r'(\d[\d,]*)\s+'          # Total volume
-                    r'(\d[\d,]*)\s+'          # Open interest
-                    r'([+-])\s*(\d[\d,]*)\s+' # OI change with sign
-                    r'(\d[\d,]*)\s+'          # YoY volume
-                    r'(\d[\d,]*)',            # YoY OI
-                    line
-                )
-                
-                if match:
-                    groups = match.groups()
-                    # Parse numbers, handling optional groups
-                    nums = [parse_int(g) if g else 0 for g in groups if g and g not in ['+', '-']]
-                    sign = 1 if '+' in groups else -1
-                    
-                    if len(nums) >= 5:
-                        # Try to identify which is which based on expected ranges
-                        # Globex vol and total vol should be similar
-                        # OI is typically larger than vol for main contracts
-                        
-                        # Find the sign position to split properly
-                        sign_idx = groups.index('+') if '+' in groups else groups.index('-') if '-' in groups else -1
-                        
-                        # Parse the numbers before and after sign
-                        before_sign = [parse_int(g) for g in groups[:sign_idx] if g and g not in ['+', '-', None]]
-                        after_sign = [parse_int(g) for g in groups[sign_idx+1:] if g and g not in ['+', '-', None]]
-                        
-                        if len(before_sign) >= 2 and len(after_sign) >= 3:
-                            total_vol = before_sign[-2]  # Second to last before sign
-                            oi = before_sign[-1]         # Last before sign
-                            oi_chg = after_sign[0]       # First after sign
-                            yoy_vol = after_sign[-2] if len(after_sign) >= 2 else 0
-                            yoy_oi = after_sign[-1] if len(after_sign) >= 1 else 0
-                            
-                            product_data = {
-                                'symbol': symbol,
-                                'name': name,
-                                'globex_volume': before_sign[0],
-                                'total_volume': total_vol,
-                                'open_interest': oi,
-                                'oi_change': sign * oi_chg,
-                                'yoy_volume': yoy_vol,
-                                'yoy_open_interest': yoy_oi,
-                            }
-                            
-                            products.append(product_data)
-                            print(f"  {symbol}: Vol={product_data['total_volume']:,}, OI={product_data['open_interest']:,}, OI Chg={product_data['oi_change']:+,}, YoY Vol={product_data['yoy_volume']:,}")
-                break
+        # The sign may be separate ("- 6482") or attached ("-6482")
+        if len(token) == 1:
+            after_sign = tokens[sign_idx + 1:sign_idx + 4]
+        else:
+            after_sign = [token[1:]] + tokens[sign_idx + 1:sign_idx + 3]
+        if len(after_sign) < 3 or not all(t.isdecimal() for t in after_sign):
+            continue
+        
+        start = sign_idx
+        while start > 0 and sign_idx - start < 5 and tokens[start - 1].isdecimal():
+            start -= 1
+        if sign_idx - start < 3:
+            continue
+        
+        before_sign = list(map(int, tokens[start:sign_idx]))
+        oi_chg, yoy_vol, yoy_oi = map(int, after_sign)
+        sign = 1 if token[0] == '+' else -1
+        
+        return {
+            'symbol': symbol,
+            'name': name,
+            'globex_volume': before_sign[0],
+            'total_volume': before_sign[-2],  # Second to last before sign
+            'open_interest': before_sign[-1],  # Last before sign
+            'oi_change': sign * oi_chg,
+            'yoy_volume': yoy_vol,
+            'yoy_open_interest': yoy_oi,
+        }
     
-    return products
+    return None
 
 
-def parse_metals_totals(text: str) -> dict:
-    """Parse overall metals totals."""
-    totals = {
+def _empty_totals() -> dict:
+    """Zeroed totals structure, filled in as the METALS total rows are found."""
+    return {
         'futures_options': {
             'volume': 0,
             'open_interest': 0,
@@ -235,63 +251,122 @@ def parse_metals_totals(text: str) -> dict:
             'yoy_open_interest': 0,
         },
     }
-    
-    # Pattern for METALS totals
-    # METALS                                   4117194                      66985    4184179          2491050    +        26475        632570          1581375
-    
-    patterns = [
-        (r'FUTURES & OPTIONS -\s*\n\s*METALS\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s*([+-])\s*([\d,]+)\s+([\d,]+)\s+([\d,]+)', 'futures_options'),
-        (r'FUTURES ONLY -\s*\n\s*METALS\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s*([+-])\s*([\d,]+)\s+([\d,]+)\s+([\d,]+)', 'futures_only'),
-        (r'OPTIONS ONLY -\s*\n\s*METALS\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s*([+-])\s*([\d,]+)\s+([\d,]+)\s+([\d,]+)', 'options_only'),
-    ]
-    
-    for pattern, key in patterns:
-        match = re.search(pattern, text, re.MULTILINE | re.IGNORECASE)
-        if match:
-            groups = match.groups()
-            if key == 'futures_options':
-                totals[key] = {
-                    'globex_volume': parse_int(groups[0]),
-                    'pnt_volume': parse_int(groups[1]),
-                    'volume': parse_int(groups[2]),
-                    'open_interest': parse_int(groups[3]),
-                    'oi_change': (1 if groups[4] == '+' else -1) * parse_int(groups[5]),
-                    'yoy_volume': parse_int(groups[6]),
-                    'yoy_open_interest': parse_int(groups[7]),
-                }
-            elif key == 'futures_only':
-                totals[key] = {
-                    'globex_volume': parse_int(groups[0]),
-                    'pnt_volume': parse_int(groups[1]),
-                    'volume': parse_int(groups[2]),
-                    'open_interest': 0,  # Not in simpler format
-                    'oi_change': (1 if groups[3] == '+' else -1) * parse_int(groups[4]),
-                    'yoy_volume': parse_int(groups[5]),
-                    'yoy_open_interest': parse_int(groups[6]),
-                }
-    
-    return totals
+
+
+def _apply_totals_match(totals: dict, key: str, groups: tuple) -> None:
+    """Store one matched METALS total row under its key."""
+    if key == 'futures_options':
+        totals[key] = {
+            'globex_volume': parse_int(groups[0]),
+            'pnt_volume': parse_int(groups[1]),
+            'volume': parse_int(groups[2]),
+            'open_interest': parse_int(groups[3]),
+            'oi_change': (1 if groups[4] == '+' else -1) * parse_int(groups[5]),
+            'yoy_volume': parse_int(groups[6]),
+            'yoy_open_interest': parse_int(groups[7]),
+        }
+    elif key == 'futures_only':
+        totals[key] = {
+            'globex_volume': parse_int(groups[0]),
+            'pnt_volume': parse_int(groups[1]),
+            'volume': parse_int(groups[2]),
+            'open_interest': 0,  # Not in simpler format
+            'oi_change': (1 if groups[3] == '+' else -1) * parse_int(groups[4]),
+            'yoy_volume': parse_int(groups[5]),
+            'yoy_open_interest': parse_int(groups[6]),
+        }
 
 
 def parse_volume_summary(pdf_path: str) -> dict:
-    """Parse the Section 02B PDF and return structured data."""
+    """Parse the Section 02B PDF and return structured data.
+    
+    pdftotext output is parsed as it streams in: the page header is kept until
+    the METALS section starts, product rows are parsed line by line, and the
+    totals rows are matched against the previous non-blank line. Extraction is
+    stopped once the section has ended and all totals have been found. If the
+    page header lacks the bulletin number or date, the rest of the report is
+    kept and searched for them instead, as a whole-text parse would.
+    
+    Marker and anchor checks run on the raw bytes; only the header, the
+    section's lines and matched totals windows are decoded.
+    """
     print(f"[INFO] Parsing volume summary: {pdf_path}")
     
-    # Extract text from PDF
     print("[INFO] Extracting text from PDF...")
-    text = extract_pdf_text(pdf_path)
+    section_marker = b'METALS FUTURES & OPTIONS'
+    end_marker = b'VOLUME AND OPEN INTEREST "RECORDS"'
     
-    # Parse header
-    header = parse_header(text)
-    print(f"[INFO] Bulletin #{header.get('bulletin_number')} - {header.get('date')}")
+    header_lines = []
+    header = None
+    header_missing = False
+    products = []
+    totals = _empty_totals()
+    totals_pending = {key: (pattern, anchor.encode()) for pattern, key, anchor in _TOTALS_RES}
+    prev_line = b''
+    # The patterns are case-insensitive, so the anchors are tested upper-cased
+    prev_upper = b''
+    state = 'SEARCHING'
     
-    # Parse metals summary
-    print("[INFO] Extracting metals products...")
-    products = parse_metals_summary(text)
-    print(f"[INFO] Found {len(products)} products")
+    lines = iter_pdf_lines(pdf_path)
+    try:
+        for raw_line in lines:
+            line = raw_line.rstrip(b'\r\n')
+            if header_missing:
+                header_lines.append(line)
+            
+            # Totals rows span two lines: "<KIND> -" then "METALS <numbers>"
+            if totals_pending and line.strip():
+                for key, (pattern, anchor) in list(totals_pending.items()):
+                    if anchor not in prev_upper:
+                        continue
+                    match = pattern.search((prev_line + b'\n' + line).decode('utf-8', 'replace'))
+                    if match:
+                        _apply_totals_match(totals, key, match.groups())
+                        del totals_pending[key]
+                prev_line = line
+                prev_upper = line.upper()
+            
+            if state == 'SEARCHING':
+                pos = line.find(section_marker)
+                if pos == -1:
+                    header_lines.append(line)
+                    continue
+                header_lines.append(line[:pos])
+                header = parse_header(b'\n'.join(header_lines).decode('utf-8', 'replace'))
+                header_missing = header['bulletin_number'] is None or header['parsed_date'] is None
+                if header_missing:
+                    # Fall back to the whole report, so keep every line from here on
+                    header_lines[-1] = line
+                else:
+                    print(f"[INFO] Bulletin #{header.get('bulletin_number')} - {header.get('date')}")
+                print("[INFO] Extracting metals products...")
+                line = line[pos + len(section_marker):]
+                state = 'IN_METALS'
+            
+            if state == 'IN_METALS':
+                pos = line.find(end_marker)
+                if pos != -1:
+                    line = line[:pos]
+                    state = 'DONE'
+                if line.strip():
+                    product_data = _parse_product_line(line.decode('utf-8', 'replace'))
+                    if product_data:
+                        products.append(product_data)
+                        print(f"  {product_data['symbol']}: Vol={product_data['total_volume']:,}, OI={product_data['open_interest']:,}, OI Chg={product_data['oi_change']:+,}, YoY Vol={product_data['yoy_volume']:,}")
+            
+            if state == 'DONE' and not totals_pending and not header_missing:
+                break
+    finally:
+        lines.close()
     
-    # Parse totals
-    totals = parse_metals_totals(text)
+    if header is None:
+        print("[WARNING] Could not find METALS FUTURES & OPTIONS section")
+        header = parse_header(b'\n'.join(header_lines).decode('utf-8', 'replace'))
+        print(f"[INFO] Bulletin #{header.get('bulletin_number')} - {header.get('date')}")
+    elif header_missing:
+        header = parse_header(b'\n'.join(header_lines).decode('utf-8', 'replace'))
+        print(f"[INFO] Bulletin #{header.get('bulletin_number')} - {header.get('date')}")
+    print(f"[INFO] Found {len(products)} products")
     
     return {
         'bulletin_number': header.get('bulletin_number'),
@@ -303,6 +378,20 @@ def parse_volume_summary(pdf_path: str) -> dict:
     }
 
 
+def write_json(path, data) -> None:
+    """
+    Write ``data`` as 2-space indented UTF-8 JSON.
+    
+    The JSON goes to a temporary file beside ``path`` that then replaces
+    it, so the dashboard never reads a half-written file.
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data, default=str,
+                             option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+    os.replace(tmp_path, path)
+
+
 def main():
     import sys
     
@@ -332,8 +421,7 @@ def main():
     
     # Save to JSON
     output_file = project_root / 'public' / 'volume_summary.json'
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    write_json(output_file, data)
     print(f"[OK] Saved volume summary to {output_file}")
     
     print()
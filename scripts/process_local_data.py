@@ -3,33 +3,40 @@ Process local XLS warehouse stock files and delivery reports.
 Updates both data.json and the Neon database.
 """
 
-import pandas as pd
+import csv
+import hashlib
+import importlib.util
+import io
 import json
+import orjson
 import os
 import re
 from datetime import datetime
 from pathlib import Path
 
-# Optional: psycopg2 for direct database connection
-try:
-    import psycopg2
-    from psycopg2.extras import execute_values
-    HAS_PSYCOPG2 = True
-except ImportError:
-    HAS_PSYCOPG2 = False
+# pandas/numpy and psycopg2 are imported where they are used, so importing this
+# module (or running it with nothing to do) does not pay for loading them.
+
+# Optional: psycopg2 for direct database connection (probed, imported in sync_to_database)
+HAS_PSYCOPG2 = importlib.util.find_spec('psycopg2') is not None
+if not HAS_PSYCOPG2:
     print("[INFO] psycopg2 not installed. Database sync will be skipped.")
 
 # Load environment variables from .env file
 def load_env():
+    if os.environ.get('_METALSTATS_ENV_LOADED'):
+        return
+    
     env_file = Path(__file__).parent.parent / '.env'
     if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key] = value
+        for line in env_file.read_text().splitlines():
+            line = line.strip()
+            key, sep, value = line.partition('=')
+            if sep and not line.startswith('#'):
+                os.environ[key.strip()] = value.strip()
         print(f"[INFO] Loaded environment from {env_file}")
+    
+    os.environ['_METALSTATS_ENV_LOADED'] = '1'
 
 # Mapping of file names to metal names
 FILE_MAPPINGS = {
@@ -42,9 +49,40 @@ FILE_MAPPINGS = {
     'Lead_Stocks.xls': 'Lead',
 }
 
+# First-column tokens that mark a depository name
+DEPOSITORY_TOKENS = (
+    'LLC', 'INC', 'CORP', 'DEPOSITORY', 'BANK', 'TRUST', 'BRINK',
+    'MANFRA', 'MALCA', 'LOOMIS', 'ASAHI', 'JP MORGAN', 'HSBC', 
+    'MTB', 'DELAWARE', 'CNT', 'INTERNATIONAL'
+)
+
+# Delivery point names (cities for Copper, etc.)
+DELIVERY_POINTS = frozenset({
+    'BALTIMORE', 'DETROIT', 'EL PASO', 'NEW ORLEANS', 'SALT LAKE CITY',
+    'CHICAGO', 'PERTH AMBOY', 'ST LOUIS', 'TOLEDO', 'NEW HAVEN',
+    'VLISSINGEN', 'DETROIT MI', 'OWENSBORO KY'
+})
+
+# Row labels that are categories, never depository names
+CATEGORY_PREFIXES = (
+    'REGISTERED', 'PLEDGED', 'ELIGIBLE', 'TOTAL', 
+    'TROY OUNCE', 'GOLD', 'SILVER', 'COPPER', 
+    'PLATINUM', 'PALLADIUM', 'ALUMINUM', 'ZINC', 'LEAD',
+    'SHORT TONS', 'DELIVERY POINT', 'DEPOSITORY', 'METAL',
+    'COMMODITY'
+)
+
+_DEPOSITORY_RE = re.compile('|'.join(map(re.escape, DEPOSITORY_TOKENS)))
+_CATEGORY_RE = re.compile('|'.join(map(re.escape, CATEGORY_PREFIXES)))
+_REPORT_DATE_RE = re.compile(r'Report Date:\s*(\d{1,2}/\d{1,2}/\d{4})')
+_ACTIVITY_DATE_RE = re.compile(r'Activity Date:\s*(\d{1,2}/\d{1,2}/\d{4})')
+
 
 def parse_warehouse_stocks(df, metal_name):
     """Parse warehouse stocks data from DataFrame - CME format."""
+    import numpy as np
+    import pandas as pd
+    
     data = {
         'metal': metal_name,
         'report_date': None,
@@ -61,106 +99,88 @@ def parse_warehouse_stocks(df, metal_name):
     df = df.reset_index(drop=True)
     
     # Try to find date information
-    for i in range(min(15, len(df))):
-        try:
-            row_values = df.iloc[i].values
-            for val in row_values:
-                if pd.notna(val):
-                    val_str = str(val)
-                    # Look for "Report Date: MM/DD/YYYY"
-                    if 'Report Date:' in val_str:
-                        match = re.search(r'Report Date:\s*(\d{1,2}/\d{1,2}/\d{4})', val_str)
-                        if match:
-                            data['report_date'] = match.group(1)
-                    # Look for "Activity Date: MM/DD/YYYY"
-                    if 'Activity Date:' in val_str:
-                        match = re.search(r'Activity Date:\s*(\d{1,2}/\d{1,2}/\d{4})', val_str)
-                        if match:
-                            data['activity_date'] = match.group(1)
-        except:
-            pass
+    for row_values in df.head(15).to_numpy(dtype=object):
+        for val in row_values:
+            if pd.notna(val):
+                val_str = str(val)
+                # Look for "Report Date: MM/DD/YYYY"
+                if 'Report Date:' in val_str:
+                    match = _REPORT_DATE_RE.search(val_str)
+                    if match:
+                        data['report_date'] = match.group(1)
+                # Look for "Activity Date: MM/DD/YYYY"
+                if 'Activity Date:' in val_str:
+                    match = _ACTIVITY_DATE_RE.search(val_str)
+                    if match:
+                        data['activity_date'] = match.group(1)
     
     # CME format: Depository names are in column 0, followed by rows for Registered/Pledged/Eligible/Total
     # The "TOTAL TODAY" values are in column 7
     
-    current_depository = None
-    depositories_data = {}
     total_col = 7  # TOTAL TODAY column
     
-    for i in range(len(df)):
-        try:
-            row_values = df.iloc[i].values
-            first_col = str(row_values[0]).strip() if pd.notna(row_values[0]) else ''
-            
-            # Skip empty or header rows
-            if not first_col or first_col == 'nan' or first_col == 'DEPOSITORY':
-                continue
-            
-            # Check if this is a depository/delivery point name
-            is_depository_name = any(x in first_col.upper() for x in [
-                'LLC', 'INC', 'CORP', 'DEPOSITORY', 'BANK', 'TRUST', 'BRINK',
-                'MANFRA', 'MALCA', 'LOOMIS', 'ASAHI', 'JP MORGAN', 'HSBC', 
-                'MTB', 'DELAWARE', 'CNT', 'INTERNATIONAL'
-            ])
-            
-            # Also check for delivery point names (cities for Copper, etc.)
-            is_delivery_point = first_col.upper() in [
-                'BALTIMORE', 'DETROIT', 'EL PASO', 'NEW ORLEANS', 'SALT LAKE CITY',
-                'CHICAGO', 'PERTH AMBOY', 'ST LOUIS', 'TOLEDO', 'NEW HAVEN',
-                'VLISSINGEN', 'DETROIT MI', 'OWENSBORO KY'
-            ]
-            
-            # Also check if it's NOT a category row
-            is_category = any(first_col.upper().startswith(x) for x in [
-                'REGISTERED', 'PLEDGED', 'ELIGIBLE', 'TOTAL', 
-                'TROY OUNCE', 'GOLD', 'SILVER', 'COPPER', 
-                'PLATINUM', 'PALLADIUM', 'ALUMINUM', 'ZINC', 'LEAD',
-                'SHORT TONS', 'DELIVERY POINT', 'DEPOSITORY', 'METAL',
-                'COMMODITY'
-            ])
-            
-            if (is_depository_name or is_delivery_point) and not is_category:
-                current_depository = first_col
-                if current_depository not in depositories_data:
-                    depositories_data[current_depository] = {'registered': 0, 'eligible': 0}
-            elif current_depository and ('REGISTERED' in first_col.upper()):
-                # Get the TOTAL TODAY value (handles both "Registered" and "Registered (warranted)")
-                try:
-                    val = row_values[total_col] if total_col < len(row_values) else row_values[2]
-                    if pd.notna(val):
-                        depositories_data[current_depository]['registered'] = float(val)
-                except:
-                    pass
-            elif current_depository and ('ELIGIBLE' in first_col.upper()):
-                # Handles both "Eligible" and "Eligible (non-warranted)"
-                try:
-                    val = row_values[total_col] if total_col < len(row_values) else row_values[2]
-                    if pd.notna(val):
-                        depositories_data[current_depository]['eligible'] = float(val)
-                except:
-                    pass
-                    
-        except Exception as e:
-            continue
-    
-    # Build final depositories list
-    reg_sum = 0
-    elig_sum = 0
-    
-    for name, values in depositories_data.items():
-        registered = values.get('registered', 0)
-        eligible = values.get('eligible', 0)
-        
-        if registered > 0 or eligible > 0:
-            data['depositories'].append({
-                'name': name,
-                'registered': registered,
-                'eligible': eligible,
-                'total': registered + eligible
-            })
-            reg_sum += registered
-            elig_sum += eligible
-    
+    # Sheets too narrow to hold a TOTAL TODAY (or fallback) value have nothing to collect
+    if df.shape[1] <= 2:
+        return data
+    
+    # Classify every row by its first column with column-wide string ops, then
+    # walk only the rows that name a depository or carry a Registered/Eligible value
+    first_col = df.iloc[:, 0]
+    first_col = first_col.where(first_col.notna(), '').astype(str).str.strip()
+    first_upper = first_col.str.upper()
+    
+    # Check if this is a depository/delivery point name
+    is_depository_name = first_upper.str.contains(_DEPOSITORY_RE, regex=True)
+    
+    # Also check for delivery point names (cities for Copper, etc.)
+    is_delivery_point = first_upper.isin(DELIVERY_POINTS)
+    
+    # Also check if it's NOT a category row
+    is_category = first_upper.str.match(_CATEGORY_RE)
+    
+    # Skip empty or header rows
+    is_skipped = first_col.isin(['', 'nan', 'DEPOSITORY'])
+    
+    # "Registered" also covers "Registered (warranted)", "Eligible" covers "Eligible (non-warranted)"
+    is_name = ((is_depository_name | is_delivery_point) & ~is_category & ~is_skipped).to_numpy()
+    is_registered = (first_upper.str.contains('REGISTERED', regex=False) & ~is_skipped).to_numpy()
+    is_eligible = (first_upper.str.contains('ELIGIBLE', regex=False) & ~is_skipped).to_numpy()
+    
+    names = first_col.to_numpy()
+    # Get the TOTAL TODAY values as floats; blanks and non-numeric cells become NaN
+    totals_today = pd.to_numeric(
+        df.iloc[:, total_col if total_col < df.shape[1] else 2], errors='coerce'
+    ).to_numpy(dtype=float)
+    
+    # Depositories are kept as parallel arrays (name -> slot, registered[slot], eligible[slot])
+    slots = {}
+    registered = np.zeros(int(is_name.sum()))
+    eligible = np.zeros(len(registered))
+    current = -1
+    
+    for i in np.flatnonzero(is_name | is_registered | is_eligible):
+        if is_name[i]:
+            current = slots.setdefault(names[i], len(slots))
+        elif current >= 0 and (is_registered[i] or is_eligible[i]):
+            val = totals_today[i]
+            if val == val:  # not NaN
+                (registered if is_registered[i] else eligible)[current] = val
+    
+    # Build final depositories list from the depositories holding any metal
+    registered = registered[:len(slots)]
+    eligible = eligible[:len(slots)]
+    keep = (registered > 0) | (eligible > 0)
+    dep_names = np.array(list(slots), dtype=object)[keep]
+    registered = registered[keep]
+    eligible = eligible[keep]
+    
+    data['depositories'] = [
+        {'name': name, 'registered': reg, 'eligible': elig, 'total': reg + elig}
+        for name, reg, elig in zip(dep_names, registered.tolist(), eligible.tolist())
+    ]
+    
+    reg_sum = float(registered.sum())
+    elig_sum = float(eligible.sum())
     data['totals']['registered'] = reg_sum
     data['totals']['eligible'] = elig_sum
     data['totals']['total'] = reg_sum + elig_sum
@@ -170,6 +190,8 @@ def parse_warehouse_stocks(df, metal_name):
 
 def process_local_xls_files(data_dir):
     """Process all XLS files in the data directory."""
+    import pandas as pd
+    
     all_data = {}
     
     for filename, metal_name in FILE_MAPPINGS.items():
@@ -205,10 +227,16 @@ def process_local_xls_files(data_dir):
     return all_data
 
 
-def parse_date_for_db(date_str):
-    """Parse a date string to YYYY-MM-DD format for database."""
+def parse_date_for_db(date_str, default=None):
+    """Parse a date string to YYYY-MM-DD format for database.
+    
+    Falls back to ``default`` (today when not given) if the date is missing or unparseable.
+    """
+    if default is None:
+        default = datetime.now().strftime('%Y-%m-%d')
+    
     if not date_str:
-        return datetime.now().strftime('%Y-%m-%d')
+        return default
     
     # Already in ISO format
     if isinstance(date_str, str) and len(date_str) == 10 and date_str[4] == '-':
@@ -224,7 +252,13 @@ def parse_date_for_db(date_str):
         pass
     
     # Fallback to current date
-    return datetime.now().strftime('%Y-%m-%d')
+    return default
+
+
+def snapshot_hash(activity_date, totals, depositories):
+    """Stable 32-hex-digit digest of what sync_to_database writes for one metal."""
+    payload = json.dumps([activity_date, totals, depositories], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
 
 
 def sync_to_database(data):
@@ -239,6 +273,9 @@ def sync_to_database(data):
         print("[WARNING] psycopg2 not installed. Skipping database sync.")
         return
     
+    import psycopg2
+    from psycopg2.extras import execute_values
+    
     print("[INFO] Connecting to database...")
     
     conn = psycopg2.connect(database_url)
@@ -256,10 +293,14 @@ def sync_to_database(data):
                 eligible DECIMAL(20, 3) NOT NULL DEFAULT 0,
                 total DECIMAL(20, 3) NOT NULL DEFAULT 0,
                 created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                content_hash CHAR(32),
                 UNIQUE(metal, report_date)
             )
         """)
         
+        # Older databases predate the content hash used to skip unchanged snapshots
+        cur.execute("ALTER TABLE metal_snapshots ADD COLUMN IF NOT EXISTS content_hash CHAR(32)")
+        
         cur.execute("""
             CREATE TABLE IF NOT EXISTS depository_snapshots (
                 id SERIAL PRIMARY KEY,
@@ -284,56 +325,101 @@ def sync_to_database(data):
         conn.commit()
         print("[OK] Database tables verified")
         
-        # Insert/update data for each metal
-        for metal_name, metal_data in data.items():
-            try:
-                report_date = parse_date_for_db(metal_data.get('report_date'))
-                activity_date = parse_date_for_db(metal_data.get('activity_date'))
-                totals = metal_data.get('totals', {})
-                
-                # Upsert metal snapshot
-                cur.execute("""
-                    INSERT INTO metal_snapshots (metal, report_date, activity_date, registered, eligible, total)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (metal, report_date) 
-                    DO UPDATE SET 
-                        activity_date = EXCLUDED.activity_date,
-                        registered = EXCLUDED.registered,
-                        eligible = EXCLUDED.eligible,
-                        total = EXCLUDED.total,
-                        created_at = CURRENT_TIMESTAMP
-                    RETURNING id
-                """, (
-                    metal_name,
-                    report_date,
-                    activity_date,
-                    totals.get('registered', 0),
-                    totals.get('eligible', 0),
-                    totals.get('total', 0)
-                ))
-                
-                snapshot_id = cur.fetchone()[0]
-                
-                # Delete existing depositories
-                cur.execute("DELETE FROM depository_snapshots WHERE metal_snapshot_id = %s", (snapshot_id,))
-                
-                # Insert depositories
-                depositories = metal_data.get('depositories', [])
-                if depositories:
-                    execute_values(cur, """
-                        INSERT INTO depository_snapshots (metal_snapshot_id, name, registered, eligible, total)
-                        VALUES %s
-                    """, [
-                        (snapshot_id, dep['name'], dep['registered'], dep['eligible'], dep['total'])
-                        for dep in depositories
-                    ])
-                
-                conn.commit()
-                print(f"  [OK] Synced {metal_name} to database (report_date: {report_date})")
-                
-            except Exception as e:
-                conn.rollback()
-                print(f"  [ERROR] Failed to sync {metal_name}: {e}")
+        # Build one snapshot row per metal (skipping metadata entries such as '_metadata')
+        metals = [
+            (metal_name, metal_data) for metal_name, metal_data in data.items()
+            if not metal_name.startswith('_') and isinstance(metal_data, dict) and 'totals' in metal_data
+        ]
+        today = datetime.now().strftime('%Y-%m-%d')
+        report_dates = {}
+        snapshot_rows = []
+        for metal_name, metal_data in metals:
+            report_date = parse_date_for_db(metal_data.get('report_date'), today)
+            activity_date = parse_date_for_db(metal_data.get('activity_date'), today)
+            totals = metal_data.get('totals', {})
+            report_dates[metal_name] = report_date
+            snapshot_rows.append((
+                metal_name,
+                report_date,
+                activity_date,
+                totals.get('registered', 0),
+                totals.get('eligible', 0),
+                totals.get('total', 0),
+                snapshot_hash(activity_date, totals, metal_data.get('depositories', []))
+            ))
+        
+        if not snapshot_rows:
+            print("[INFO] No metal snapshots to sync")
+            return
+        
+        # Skip metals whose stored snapshot already has the same content. The
+        # totals are compared too, in case another script rewrote the row.
+        snapshots_by_metal = {row[0]: row for row in snapshot_rows}
+        cur.execute("""
+            SELECT metal, report_date::text, content_hash, registered, eligible, total
+            FROM metal_snapshots
+            WHERE metal = ANY(%s) AND report_date = ANY(%s::date[])
+        """, (list(snapshots_by_metal), list(set(report_dates.values()))))
+        unchanged = set()
+        for metal, report_date, content_hash, *stored_totals in cur.fetchall():
+            row = snapshots_by_metal[metal]
+            if (report_date == row[1] and content_hash == row[6]
+                    and all(abs(float(a) - float(b)) < 0.001 for a, b in zip(stored_totals, row[3:6]))):
+                unchanged.add(metal)
+        for metal_name in unchanged:
+            print(f"  [OK] {metal_name} unchanged (report_date: {report_dates[metal_name]}), skipped")
+        metals = [(metal_name, metal_data) for metal_name, metal_data in metals if metal_name not in unchanged]
+        snapshot_rows = [row for row in snapshot_rows if row[0] not in unchanged]
+        
+        if not snapshot_rows:
+            print("[OK] Database sync complete")
+            return
+        
+        try:
+            # Upsert all metal snapshots in one statement and collect their ids
+            returned = execute_values(cur, """
+                INSERT INTO metal_snapshots (metal, report_date, activity_date, registered, eligible, total, content_hash)
+                VALUES %s
+                ON CONFLICT (metal, report_date) 
+                DO UPDATE SET 
+                    activity_date = EXCLUDED.activity_date,
+                    registered = EXCLUDED.registered,
+                    eligible = EXCLUDED.eligible,
+                    total = EXCLUDED.total,
+                    content_hash = EXCLUDED.content_hash,
+                    created_at = CURRENT_TIMESTAMP
+                RETURNING id, metal
+            """, snapshot_rows, fetch=True)
+            snapshot_ids = {metal: snapshot_id for snapshot_id, metal in returned}
+            
+            # Delete existing depositories for every snapshot at once
+            cur.execute(
+                "DELETE FROM depository_snapshots WHERE metal_snapshot_id = ANY(%s)",
+                (list(snapshot_ids.values()),)
+            )
+            
+            # Load depositories for all metals with a single COPY
+            buf = io.StringIO()
+            csv.writer(buf).writerows(
+                (snapshot_ids[metal_name], dep['name'], dep['registered'], dep['eligible'], dep['total'])
+                for metal_name, metal_data in metals
+                for dep in metal_data.get('depositories', [])
+            )
+            if buf.tell():
+                buf.seek(0)
+                cur.copy_expert("""
+                    COPY depository_snapshots (metal_snapshot_id, name, registered, eligible, total)
+                    FROM STDIN WITH (FORMAT csv)
+                """, buf)
+            
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"  [ERROR] Failed to sync metals: {e}")
+            return
+        
+        for metal_name, _ in metals:
+            print(f"  [OK] Synced {metal_name} to database (report_date: {report_dates[metal_name]})")
         
         print("[OK] Database sync complete")
         
@@ -342,6 +428,20 @@ def sync_to_database(data):
         conn.close()
 
 
+def write_json(path, data) -> None:
+    """
+    Write ``data`` as 2-space indented UTF-8 JSON.
+    
+    The JSON goes to a temporary file beside ``path`` that then replaces
+    it, so the dashboard never reads a half-written file.
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data, default=str,
+                             option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+    os.replace(tmp_path, path)
+
+
 def main():
     print("=" * 70)
     print("  Local Data Processor - COMEX Warehouse Stocks")
@@ -365,8 +465,7 @@ def main():
     existing_data = {}
     if data_file.exists():
         try:
-            with open(data_file, 'r') as f:
-                existing_data = json.load(f)
+            existing_data = orjson.loads(data_file.read_bytes())
             print(f"[INFO] Loaded existing data from {data_file}")
         except:
             pass
@@ -407,8 +506,7 @@ def main():
         print(f"  Total: {info['totals']['total']:,.0f}")
     
     # Save data to JSON file
-    with open(data_file, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    write_json(data_file, data)
     
     print(f"\n[OK] Data saved to {data_file}")
     
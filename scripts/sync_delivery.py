@@ -3,8 +3,9 @@ Sync delivery.json to database.
 """
 
 import os
-import json
+import orjson
 import psycopg2
+from psycopg2.extras import execute_values
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -23,20 +24,35 @@ cur = conn.cursor()
 
 # Load delivery.json
 delivery_path = Path(__file__).parent.parent / 'public' / 'delivery.json'
-with open(delivery_path, 'r') as f:
-    data = json.load(f)
+data = orjson.loads(delivery_path.read_bytes())
 
 parsed_date = data.get('parsed_date')
 print(f'Syncing delivery data for: {parsed_date}')
 
-for delivery in data.get('deliveries', []):
-    cur.execute('''
+deliveries = data.get('deliveries', [])
+
+# One row per metal: a repeated metal would hit the same conflict key twice in
+# one statement, so the last occurrence wins (as with the old row-by-row upsert)
+rows = {
+    delivery['metal']: (
+        parsed_date,
+        delivery['metal'],
+        delivery['symbol'],
+        delivery.get('contract_month'),
+        delivery.get('settlement'),
+        delivery.get('daily_issued', 0),
+        delivery.get('daily_stopped', 0),
+        delivery.get('month_to_date', 0),
+    )
+    for delivery in deliveries
+}
+
+if rows:
+    execute_values(cur, '''
         INSERT INTO delivery_snapshots (
             report_date, metal, symbol, contract_month,
             settlement_price, daily_issued, daily_stopped, month_to_date
-        ) VALUES (
-            %s::date, %s, %s, %s, %s, %s, %s, %s
-        )
+        ) VALUES %s
         ON CONFLICT (metal, report_date)
         DO UPDATE SET
             symbol = EXCLUDED.symbol,
@@ -46,18 +62,13 @@ for delivery in data.get('deliveries', []):
             daily_stopped = EXCLUDED.daily_stopped,
             month_to_date = EXCLUDED.month_to_date,
             created_at = CURRENT_TIMESTAMP
-    ''', (
-        parsed_date,
-        delivery['metal'],
-        delivery['symbol'],
-        delivery.get('contract_month'),
-        delivery.get('settlement'),
-        delivery.get('daily_issued', 0),
-        delivery.get('daily_stopped', 0),
-        delivery.get('month_to_date', 0),
+    ''', list(rows.values()), template='(%s::date, %s, %s, %s, %s, %s, %s, %s)', page_size=1000)
+
+if deliveries:
+    print('\n'.join(
+        f"  {delivery['metal']} ({delivery['symbol']}): MTD={delivery.get('month_to_date', 0):,} contracts"
+        for delivery in deliveries
     ))
-    mtd = delivery.get('month_to_date', 0)
-    print(f"  {delivery['metal']} ({delivery['symbol']}): MTD={mtd:,} contracts")
 
 conn.commit()
 cur.close()
@@ -3,35 +3,129 @@ Parse CME Group Daily Bulletin Section 62 (Metal Futures Products) from PDF text
 Extracts volume, open interest, and settlement prices for key metals.
 """
 
-import json
+import csv
+import hashlib
+import heapq
+import io
+import orjson
 import re
 import os
 import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
+from types import MappingProxyType
+
+# Products tracked from the bulletin: (symbol, product name, Section 62 header)
+_PRODUCT_CONFIGS = (
+    ('1OZ', '1 OUNCE GOLD FUTURES', '1OZ FUT'),
+    ('GC', 'COMEX GOLD FUTURES', 'GC FUT'),
+    ('SI', 'COMEX SILVER FUTURES', 'SI FUT'),
+    ('SIL', 'MICRO SILVER FUTURES', 'SIL FUT'),
+    ('HG', 'COMEX COPPER FUTURES', 'HG FUT'),
+    ('PL', 'NYMEX PLATINUM FUTURES', 'PL FUT'),
+    ('PA', 'NYMEX PALLADIUM FUTURES', 'PA FUT'),
+    ('ALI', 'COMEX PHYSICAL ALUMINUM FUTURES', 'ALI FUT'),
+    ('MGC', 'MICRO GOLD FUTURES', 'MGC FUT'),
+    ('MHG', 'COMEX MICRO COPPER FUTURES', 'MHG FUT'),
+    ('QO', 'E-MINI GOLD FUTURES', 'QO FUT'),
+    ('QI', 'E-MINI SILVER FUTURES', 'QI FUT'),
+)
+
+# Compiled once at import instead of on every call (and every product)
+_BULLETIN_RE = re.compile(r'BULLETIN\s*#\s*(\d+)', re.IGNORECASE)
+_DATE_RE = re.compile(
+    r'(Mon|Tue|Wed|Thu|Fri|Sat|Sun)[,.]?\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),?\s+(\d{4})',
+    re.IGNORECASE
+)
+# The header sits at the top of the bulletin; only search further if it is not there
+_HEADER_SCAN_CHARS = 2048
+# Read-only; the date pattern only captures three-letter month names
+_MONTH_MAP = MappingProxyType({
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+})
+
+# Section 02B product totals, tried in order per symbol:
+# (PyPDF2 format, pdftotext format, Section 62 TOTAL line)
+_PRODUCT_TOTAL_RES = {
+    symbol: (
+        re.compile(rf'(\d+)\s+{re.escape(name)}\s+(\d+)\s+([+-])\s*(\d+).*?{symbol}\b', re.IGNORECASE),
+        re.compile(rf'^{symbol}\s+.*?(\d+)\s+(\d+)\s+([+-])\s+(\d+)', re.MULTILINE),
+        re.compile(rf'TOTAL\s+{symbol}\s+FUT\s+(\d+)\s+(?:\d+\s+)?(\d+)\s+([+-])\s+(\d+)'),
+    )
+    for symbol, name, _ in _PRODUCT_CONFIGS
+}
+
+# Sort key for contract records, busiest first
+_BY_VOLUME = itemgetter('globex_volume')
+
+# PyPDF2 contract line: MONTH +/- VOLUME CHANGE SETTLE HIGH/LOW OI +/- OI_CHANGE
+_CONTRACT_RE = re.compile(r'([A-Z]{3})(\d{2})\s+([+-])\s*(\d+)\s+([\d.]+)\s+([\d.]+)\s+([\d./BA\s]+)\s+(\d+)\s+([+-])\s*(\d+)')
+# 1OZ, GC and HG contract sections run from the header to "TOTAL <symbol> FUT";
+# the lookahead captures the symbol so the section ends at its own TOTAL line
+_CONTRACT_HEADER_RE = re.compile(
+    r'(?=(1OZ|GC|HG) )(?:1OZ FUT|GC FUT COMEX GOLD FUTURES|HG FUT COMEX COPPER FUTURES)',
+    re.IGNORECASE
+)
+_CONTRACT_END_RES = {
+    symbol: re.compile(rf'TOTAL {symbol} FUT', re.IGNORECASE)
+    for symbol in ('1OZ', 'GC', 'HG')
+}
+
+# Section 62 (pdftotext -layout): every product's "SYMBOL FUT PRODUCT_NAME"
+# header and "TOTAL SYMBOL FUT" section end, so one pass can index all sections.
+# The TOTAL branch only consumes "TOTAL " so a header right after it still matches.
+_SECTION62_MARK_RE = re.compile(
+    '(?P<header>' + '|'.join(rf'{re.escape(header)}\s+{re.escape(name)}' for _, name, header in _PRODUCT_CONFIGS) + ')'
+    + r'|TOTAL\s+(?=(?P<total>' + '|'.join(re.escape(header) for _, _, header in _PRODUCT_CONFIGS) + '))',
+    re.IGNORECASE
+)
+# Section 62 TOTAL line per product
+_SECTION62_TOTAL_RES = {
+    symbol: re.compile(rf'TOTAL\s+{re.escape(header)}\s+(\d+).*?(\d+)\s+([+-])\s*(\d+)', re.IGNORECASE)
+    for symbol, _, header in _PRODUCT_CONFIGS
+}
+# Contract line pattern for Section 62 (pdftotext -layout format):
+# MONTH   OPEN(or ----)   HIGH/LOW(or ----)   SETTLE [+-] CHANGE   VOLUME(or ----)   PNT(or ----)   OI   [+-] OI_CHANGE(or UNCH)
+# Example: FEB26                        3007.25             3008.00 /3007.25        3004.00 +   78.75                        3           ----                 5    -       2
+# Example: NOV26                        ----                ----                    3097.00 +   67.00                     ----           ----               282         UNCH
+_SECTION62_CONTRACT_RE = re.compile(r'([A-Z]{3}\d{2})\s+(?:[\d.]+[BA]?|----)\s+(?:[\d.]+[BA]?\s*/[\d.]+[BA]?|----)\s+([\d.]+)\s+([+-])\s+([\d.]+)\s+([\d]+|----)\s+([\d]+|----)\s+([\d]+)\s+(?:([+-])\s*(\d+)|UNCH)')
 
 # Load environment variables from .env file
 def load_env():
+    # Once per process, shared with the other scripts that load .env
+    if os.environ.get('_METALSTATS_ENV_LOADED'):
+        return
+    
     env_file = Path(__file__).parent.parent / '.env'
     if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key] = value
+        for line in env_file.read_text().splitlines():
+            line = line.strip()
+            key, sep, value = line.partition('=')
+            if sep and not line.startswith('#'):
+                os.environ[key.strip()] = value.strip()
+    
+    os.environ['_METALSTATS_ENV_LOADED'] = '1'
 
 
 def extract_pdf_text(pdf_path: str) -> str:
     """Extract text from PDF using pdftotext."""
+    cmd = ['pdftotext', '-layout', '-enc', 'UTF-8', pdf_path, '-']
     try:
-        result = subprocess.run(
-            ['pdftotext', '-layout', pdf_path, '-'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout
+        # Read stdout straight off the pipe and decode it once, rather than
+        # letting subprocess.run collect chunks, join and newline-translate them
+        with tempfile.TemporaryFile() as err:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err)
+            with proc.stdout:
+                raw = proc.stdout.read()
+            if proc.wait() != 0:
+                err.seek(0)
+                raise subprocess.CalledProcessError(proc.returncode, cmd, raw, err.read())
+        return raw.decode('utf-8', 'replace')
     except FileNotFoundError:
         print("[WARNING] pdftotext not found. Trying alternate method...")
         # Fallback: try using PyPDF2 or similar
@@ -39,14 +133,21 @@ def extract_pdf_text(pdf_path: str) -> str:
             import PyPDF2
             with open(pdf_path, 'rb') as f:
                 reader = PyPDF2.PdfReader(f)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+                # Join once instead of growing one string page by page
+                return ''.join(f"{page.extract_text() or ''}\n" for page in reader.pages)
         except ImportError:
             raise RuntimeError("Install pdftotext (poppler) or PyPDF2 to parse PDFs")
 
 
+def _search_header(pattern: re.Pattern, text: str):
+    """Search the top of the bulletin first, falling back to the whole text."""
+    match = pattern.search(text, 0, _HEADER_SCAN_CHARS)
+    # A match running into the window edge may be cut short (e.g. a truncated number)
+    if match and match.end() < _HEADER_SCAN_CHARS:
+        return match
+    return pattern.search(text)
+
+
 def parse_bulletin_header(text: str) -> dict:
     """Parse bulletin header to extract date and bulletin number."""
     result = {
@@ -56,32 +157,22 @@ def parse_bulletin_header(text: str) -> dict:
     }
     
     # Find bulletin number: "BULLETIN # 13@" or "BULLETIN # 13"
-    bulletin_match = re.search(r'BULLETIN\s*#\s*(\d+)', text, re.IGNORECASE)
+    bulletin_match = _search_header(_BULLETIN_RE, text)
     if bulletin_match:
         result['bulletin_number'] = int(bulletin_match.group(1))
     
     # Find date: "Wed, Jan 21, 2026" or "PG62 Wed, Jan 21, 2026"
-    date_patterns = [
-        r'(Mon|Tue|Wed|Thu|Fri|Sat|Sun)[,.]?\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),?\s+(\d{4})',
-    ]
-    
-    for pattern in date_patterns:
-        date_match = re.search(pattern, text, re.IGNORECASE)
-        if date_match:
-            result['date'] = date_match.group(0).lower()
-            # Parse to ISO format
-            try:
-                month_map = {
-                    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-                    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-                }
-                month = month_map.get(date_match.group(2).lower()[:3], 1)
-                day = int(date_match.group(3))
-                year = int(date_match.group(4))
-                result['parsed_date'] = f"{year:04d}-{month:02d}-{day:02d}"
-            except (ValueError, IndexError):
-                pass
-            break
+    date_match = _search_header(_DATE_RE, text)
+    if date_match:
+        result['date'] = date_match.group(0).lower()
+        # Parse to ISO format
+        try:
+            month = _MONTH_MAP.get(date_match.group(2).lower(), 1)
+            day = int(date_match.group(3))
+            year = int(date_match.group(4))
+            result['parsed_date'] = f"{year:04d}-{month:02d}-{day:02d}"
+        except (ValueError, IndexError):
+            pass
     
     return result
 
@@ -96,272 +187,132 @@ def parse_product_totals(text: str) -> dict:
     # 531609	COMEX GOLD FUTURES 655762 - 7555	640341 583174	337585	15421	GC
     # pdftotext format (symbol at START of line):
     # MGC MICRO GOLD FUTURES ... 557540 82478 + 4481
-    
-    product_configs = [
-        ('1OZ', '1 OUNCE GOLD FUTURES'),
-        ('GC', 'COMEX GOLD FUTURES'),
-        ('SI', 'COMEX SILVER FUTURES'),
-        ('SIL', 'MICRO SILVER FUTURES'),
-        ('HG', 'COMEX COPPER FUTURES'),
-        ('PL', 'NYMEX PLATINUM FUTURES'),
-        ('PA', 'NYMEX PALLADIUM FUTURES'),
-        ('ALI', 'COMEX PHYSICAL ALUMINUM FUTURES'),
-        ('MGC', 'MICRO GOLD FUTURES'),
-        ('MHG', 'COMEX MICRO COPPER FUTURES'),
-        ('QO', 'E-MINI GOLD FUTURES'),
-        ('QI', 'E-MINI SILVER FUTURES'),
-    ]
-    
-    for symbol, name in product_configs:
-        # Try PyPDF2 format first (symbol at end of line)
-        # Format: VOLUME NAME OI SIGN OI_CHANGE ... SYMBOL
-        # Example: 531609	COMEX GOLD FUTURES 655762 - 7555	640341 583174	337585	15421	GC
-        # Note: sometimes the sign is attached to the number: -14103 instead of - 14103
-        pattern = rf'(\d+)\s+{re.escape(name)}\s+(\d+)\s+([+-])\s*(\d+).*?{symbol}\b'
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            try:
-                total_volume = int(match.group(1))
-                total_oi = int(match.group(2))
-                sign = match.group(3)
-                oi_change = int(match.group(4))
-                if sign == '-':
-                    oi_change = -oi_change
-                
-                products[symbol] = {
-                    'symbol': symbol,
-                    'name': name,
-                    'contracts': [],
-                    'total_volume': total_volume,
-                    'total_open_interest': total_oi,
-                    'total_oi_change': oi_change,
-                }
-                continue
-            except (ValueError, IndexError):
-                pass
-        
-        # Try pdftotext format (symbol at start of line)
-        # Pattern: SYMBOL NAME ... numbers ... COMBINED_VOL OI SIGN OI_CHANGE
-        pattern = rf'^{symbol}\s+.*?(\d+)\s+(\d+)\s+([+-])\s+(\d+)'
-        match = re.search(pattern, text, re.MULTILINE)
-        if match:
-            try:
-                total_volume = int(match.group(1))
-                total_oi = int(match.group(2))
-                sign = match.group(3)
-                oi_change = int(match.group(4))
-                if sign == '-':
-                    oi_change = -oi_change
-                
-                products[symbol] = {
-                    'symbol': symbol,
-                    'name': name,
-                    'contracts': [],
-                    'total_volume': total_volume,
-                    'total_open_interest': total_oi,
-                    'total_oi_change': oi_change,
-                }
-                continue
-            except (ValueError, IndexError):
-                pass
+    #
+    # Per symbol, the first line in each format is kept, and formats are
+    # preferred in this order:
+    # 1. PyPDF2 (symbol at end of line)
+    #    Format: VOLUME NAME OI SIGN OI_CHANGE ... SYMBOL
+    #    Note: sometimes the sign is attached to the number: -14103 instead of - 14103
+    # 2. pdftotext (symbol at start of line)
+    #    Pattern: SYMBOL NAME ... numbers ... COMBINED_VOL OI SIGN OI_CHANGE
+    # 3. Section62 format (TOTAL lines)
+    # All three are found in one sweep over the lines; a regex only runs on a
+    # line that contains its literal anchor.
+    upper_text = text.upper()
+    # Every format contains the symbol itself, so symbols absent from the text
+    # are never checked line by line
+    configs = [config for config in _PRODUCT_CONFIGS if config[0] in upper_text]
+    found = {symbol: [None, None, None] for symbol, _, _ in configs}
+    # Symbols still without a PyPDF2 match; once none are left nothing can change
+    pending = len(found)
+    
+    for line, upper_line in zip(text.split('\n'), upper_text.split('\n')):
+        if not pending:
+            break
+        has_total = 'TOTAL' in line
         
-        # Fallback to Section62 format (TOTAL lines)
-        pattern = rf'TOTAL\s+{symbol}\s+FUT\s+(\d+)\s+(?:\d+\s+)?(\d+)\s+([+-])\s+(\d+)'
-        match = re.search(pattern, text)
-        if match:
-            try:
-                total_volume = int(match.group(1))
-                total_oi = int(match.group(2))
-                sign = match.group(3)
-                oi_change = int(match.group(4))
-                if sign == '-':
-                    oi_change = -oi_change
-                
-                products[symbol] = {
-                    'symbol': symbol,
-                    'name': name,
-                    'contracts': [],
-                    'total_volume': total_volume,
-                    'total_open_interest': total_oi,
-                    'total_oi_change': oi_change,
-                }
-            except (ValueError, IndexError):
+        for symbol, name, _ in configs:
+            matches = found[symbol]
+            if matches[0]:
                 continue
-    
-    return products
-
-
-def parse_contracts(text: str, products: dict) -> dict:
-    """Parse individual contract data for each product."""
-    
-    # Contract line patterns - different products have different formats
-    # Format: MONTH +/- VOLUME CHANGE SETTLE HIGH/LOW OI OI_CHANGE OPEN ---
-    # Example: FEB26 + 131092	71.75	4837.50	4890.75 /4756.75 16336 + 773	4768.75 ----
-    
-    # For 1OZ Gold: FEB26 + 131092	71.75	4837.50	...
-    contract_pattern = r'([A-Z]{3})(\d{2})\s+([+-]?)\s*(\d+)\s+([\d.]+)\s+([\d.]+)'
-    
-    for match in re.finditer(contract_pattern, text):
-        try:
-            month = match.group(1) + match.group(2)
-            sign = match.group(3)
-            volume = int(match.group(4))
-            change = float(match.group(5))
-            settle = float(match.group(6))
-            
-            if sign == '-':
-                change = -change
-            
-            # Find which product this belongs to by looking at context
-            # For now, just store the raw contract data
-            contract = {
-                'month': month,
-                'settle': settle,
-                'change': change,
-                'globex_volume': volume,
-                'pnt_volume': 0,
-                'oi_change': 0,
-            }
+            pypdf_re, pdftotext_re, total_re = _PRODUCT_TOTAL_RES[symbol]
             
-        except (ValueError, IndexError):
+            if name in upper_line:
+                matches[0] = pypdf_re.search(line)
+                if matches[0]:
+                    pending -= 1
+                    continue
+            if matches[1] is None and line.startswith(symbol):
+                matches[1] = pdftotext_re.match(line)
+            if matches[2] is None and has_total and symbol in line:
+                matches[2] = total_re.search(line)
+    
+    for symbol, name, _ in configs:
+        match = next((m for m in found[symbol] if m), None)
+        if not match:
             continue
+        
+        total_volume = int(match.group(1))
+        total_oi = int(match.group(2))
+        sign = match.group(3)
+        oi_change = int(match.group(4))
+        if sign == '-':
+            oi_change = -oi_change
+        
+        products[symbol] = {
+            'symbol': symbol,
+            'name': name,
+            'contracts': [],
+            'total_volume': total_volume,
+            'total_open_interest': total_oi,
+            'total_oi_change': oi_change,
+        }
     
     return products
 
 
-def parse_1oz_gold_contracts(text: str) -> list:
-    """Parse 1OZ Gold futures contracts."""
-    contracts = []
+def parse_contract_sections(text: str) -> dict:
+    """Parse 1OZ, GC and HG futures contracts in a single pass over the text.
     
-    # Find the 1OZ FUT section
-    section_match = re.search(r'1OZ FUT.*?TOTAL 1OZ FUT', text, re.DOTALL | re.IGNORECASE)
-    if not section_match:
-        return contracts
+    Returns {symbol: contracts} for each section found, contracts sorted by
+    volume descending.
+    """
+    sections = {}
+    # Symbols with no TOTAL line after their header; later headers can't close either
+    unterminated = set()
     
-    section = section_match.group(0)
-    
-    # Pattern for 1oz lines: FEB26 + 131092	71.75	4837.50	...
-    pattern = r'([A-Z]{3})(\d{2})\s+([+-])\s*(\d+)\s+([\d.]+)\s+([\d.]+)\s+([\d./BA\s]+)\s+(\d+)\s+([+-])\s*(\d+)'
-    
-    for match in re.finditer(pattern, section):
-        try:
-            month = match.group(1) + match.group(2)
-            sign = match.group(3)
-            volume = int(match.group(4))
-            change = float(match.group(5))
-            if sign == '-':
-                change = -change
-            settle = float(match.group(6))
-            oi = int(match.group(8))
-            oi_sign = match.group(9)
-            oi_change = int(match.group(10))
-            if oi_sign == '-':
-                oi_change = -oi_change
-            
-            contracts.append({
-                'month': month,
-                'settle': settle,
-                'change': change,
-                'globex_volume': volume,
-                'pnt_volume': 0,
-                'open_interest': oi,
-                'oi_change': oi_change,
-            })
-        except (ValueError, IndexError):
+    pos = 0
+    while True:
+        header = _CONTRACT_HEADER_RE.search(text, pos)
+        if not header:
+            break
+        symbol = header.group(1).upper()
+        if symbol in unterminated:
+            pos = header.start() + 1
             continue
-    
-    # Sort by volume descending
-    contracts.sort(key=lambda x: x['globex_volume'], reverse=True)
-    return contracts
-
-
-def parse_gc_contracts(text: str) -> list:
-    """Parse GC (COMEX Gold) futures contracts."""
-    contracts = []
-    
-    # Find the GC FUT section
-    section_match = re.search(r'GC FUT COMEX GOLD FUTURES.*?TOTAL GC FUT', text, re.DOTALL | re.IGNORECASE)
-    if not section_match:
-        return contracts
-    
-    section = section_match.group(0)
-    
-    # Pattern for GC lines: JAN26 + 1706	72.20	4831.80	4872.30 /4771.50 1801 + 1518	4863.50 ----
-    pattern = r'([A-Z]{3})(\d{2})\s+([+-])\s*(\d+)\s+([\d.]+)\s+([\d.]+)\s+([\d./BA\s]+)\s+(\d+)\s+([+-])\s*(\d+)'
-    
-    for match in re.finditer(pattern, section):
-        try:
-            month = match.group(1) + match.group(2)
-            sign = match.group(3)
-            volume = int(match.group(4))
-            change = float(match.group(5))
-            if sign == '-':
-                change = -change
-            settle = float(match.group(6))
-            oi = int(match.group(8))
-            oi_sign = match.group(9)
-            oi_change = int(match.group(10))
-            if oi_sign == '-':
-                oi_change = -oi_change
-            
-            contracts.append({
-                'month': month,
-                'settle': settle,
-                'change': change,
-                'globex_volume': volume,
-                'pnt_volume': 0,
-                'open_interest': oi,
-                'oi_change': oi_change,
-            })
-        except (ValueError, IndexError):
+        
+        end = _CONTRACT_END_RES[symbol].search(text, header.end())
+        if not end:
+            unterminated.add(symbol)
+            pos = header.start() + 1
             continue
-    
-    contracts.sort(key=lambda x: x['globex_volume'], reverse=True)
-    return contracts
-
-
-def parse_hg_contracts(text: str) -> list:
-    """Parse HG (COMEX Copper) futures contracts."""
-    contracts = []
-    
-    section_match = re.search(r'HG FUT COMEX COPPER FUTURES.*?TOTAL HG FUT', text, re.DOTALL | re.IGNORECASE)
-    if not section_match:
-        return contracts
-    
-    section = section_match.group(0)
-    
-    # Copper has different price format (5 decimal places)
-    pattern = r'([A-Z]{3})(\d{2})\s+([+-])\s*(\d+)\s+([\d.]+)\s+([\d.]+)\s+([\d./BA\s]+)\s+(\d+)\s+([+-])\s*(\d+)'
-    
-    for match in re.finditer(pattern, section):
-        try:
-            month = match.group(1) + match.group(2)
-            sign = match.group(3)
-            volume = int(match.group(4))
-            change = float(match.group(5))
-            if sign == '-':
-                change = -change
-            settle = float(match.group(6))
-            oi = int(match.group(8))
-            oi_sign = match.group(9)
-            oi_change = int(match.group(10))
-            if oi_sign == '-':
-                oi_change = -oi_change
-            
-            contracts.append({
-                'month': month,
-                'settle': settle,
-                'change': change,
-                'globex_volume': volume,
-                'pnt_volume': 0,
-                'open_interest': oi,
-                'oi_change': oi_change,
-            })
-        except (ValueError, IndexError):
+        pos = end.end()
+        if symbol in sections:
             continue
+        
+        contracts = []
+        for match in _CONTRACT_RE.finditer(text, header.start(), end.end()):
+            try:
+                month = match.group(1) + match.group(2)
+                sign = match.group(3)
+                volume = int(match.group(4))
+                change = float(match.group(5))
+                if sign == '-':
+                    change = -change
+                settle = float(match.group(6))
+                oi = int(match.group(8))
+                oi_sign = match.group(9)
+                oi_change = int(match.group(10))
+                if oi_sign == '-':
+                    oi_change = -oi_change
+                
+                contracts.append({
+                    'month': month,
+                    'settle': settle,
+                    'change': change,
+                    'globex_volume': volume,
+                    'pnt_volume': 0,
+                    'open_interest': oi,
+                    'oi_change': oi_change,
+                })
+            except (ValueError, IndexError):
+                continue
+        
+        # Sort by volume descending
+        contracts.sort(key=_BY_VOLUME, reverse=True)
+        sections[symbol] = contracts
     
-    contracts.sort(key=lambda x: x['globex_volume'], reverse=True)
-    return contracts
+    return sections
 
 
 def build_bulletin_data(text: str) -> dict:
@@ -374,14 +325,9 @@ def build_bulletin_data(text: str) -> dict:
     products = parse_product_totals(text)
     
     # Add contract details for key products
-    if '1OZ' in products:
-        products['1OZ']['contracts'] = parse_1oz_gold_contracts(text)
-    
-    if 'GC' in products:
-        products['GC']['contracts'] = parse_gc_contracts(text)
-    
-    if 'HG' in products:
-        products['HG']['contracts'] = parse_hg_contracts(text)
+    for symbol, contracts in parse_contract_sections(text).items():
+        if symbol in products:
+            products[symbol]['contracts'] = contracts
     
     return {
         'bulletin_number': header.get('bulletin_number'),
@@ -392,22 +338,66 @@ def build_bulletin_data(text: str) -> dict:
     }
 
 
-def save_to_database(data: dict, database_url: str):
-    """Save bulletin data to PostgreSQL database."""
+def save_to_database(data: dict, database_url: str) -> bool:
+    """Save bulletin data to PostgreSQL database.
+    
+    Returns False if the save was attempted and failed, True otherwise.
+    """
     try:
         import psycopg2
     except ImportError:
         print("[WARNING] psycopg2 not installed. Skipping database save.")
-        return
+        return True
     
     if not database_url:
         print("[INFO] DATABASE_URL not set. Skipping database save.")
-        return
+        return True
+    
+    parsed_date = data.get('parsed_date')
+    if not parsed_date:
+        print("[WARNING] No parsed date. Skipping database save.")
+        return True
+    
+    # One row per symbol; a repeated symbol keeps its last entry, as the
+    # old per-row upserts did
+    rows = {}
+    for product in data.get('products', []):
+        front = product['contracts'][0] if product.get('contracts') else {}
+        rows[product['symbol']] = (
+            parsed_date,
+            product['symbol'],
+            product['name'],
+            product['total_volume'],
+            product['total_open_interest'],
+            product['total_oi_change'],
+            front.get('month'),
+            front.get('settle'),
+            front.get('change'),
+        )
+    
+    if not rows:
+        print("[INFO] No products to save.")
+        return True
+    
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows.values())
+    buf.seek(0)
     
     try:
         conn = psycopg2.connect(database_url)
+    except Exception as e:
+        print(f"[ERROR] Database error: {e}")
+        return False
+    
+    try:
+        # Schema setup and the load commit together as a single transaction
+        conn.autocommit = False
         cur = conn.cursor()
         
+        # The upsert is idempotent and can simply be re-run, so don't wait
+        # for the WAL flush on commit
+        cur.execute("SET LOCAL synchronous_commit = off")
+        
         # Create table if not exists
         cur.execute("""
             CREATE TABLE IF NOT EXISTS bulletin_snapshots (
@@ -431,110 +421,91 @@ def save_to_database(data: dict, database_url: str):
             ON bulletin_snapshots(date, symbol)
         """)
         
-        conn.commit()
-        
-        parsed_date = data.get('parsed_date')
-        if not parsed_date:
-            print("[WARNING] No parsed date. Skipping database save.")
-            return
-        
-        saved_count = 0
-        
-        for product in data.get('products', []):
-            try:
-                front_month = None
-                front_settle = None
-                front_change = None
-                
-                if product.get('contracts'):
-                    front = product['contracts'][0]
-                    front_month = front.get('month')
-                    front_settle = front.get('settle')
-                    front_change = front.get('change')
-                
-                cur.execute("""
-                    INSERT INTO bulletin_snapshots (
-                        date, symbol, product_name,
-                        total_volume, total_open_interest, total_oi_change,
-                        front_month, front_month_settle, front_month_change
-                    ) VALUES (
-                        %s::date, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
-                    ON CONFLICT (date, symbol) 
-                    DO UPDATE SET
-                        product_name = EXCLUDED.product_name,
-                        total_volume = EXCLUDED.total_volume,
-                        total_open_interest = EXCLUDED.total_open_interest,
-                        total_oi_change = EXCLUDED.total_oi_change,
-                        front_month = EXCLUDED.front_month,
-                        front_month_settle = EXCLUDED.front_month_settle,
-                        front_month_change = EXCLUDED.front_month_change,
-                        created_at = CURRENT_TIMESTAMP
-                """, (
-                    parsed_date,
-                    product['symbol'],
-                    product['name'],
-                    product['total_volume'],
-                    product['total_open_interest'],
-                    product['total_oi_change'],
-                    front_month,
-                    front_settle,
-                    front_change,
-                ))
-                saved_count += 1
-            except Exception as e:
-                print(f"  [WARNING] Error saving {product['symbol']}: {e}")
-        
+        # Stage everything with a single COPY, then merge with one upsert
+        cur.execute("""
+            CREATE TEMP TABLE tmp_bulletin_snapshots ON COMMIT DROP AS
+            SELECT date, symbol, product_name, total_volume, total_open_interest,
+                   total_oi_change, front_month, front_month_settle, front_month_change
+            FROM bulletin_snapshots WITH NO DATA
+        """)
+        cur.copy_expert("""
+            COPY tmp_bulletin_snapshots (
+                date, symbol, product_name, total_volume, total_open_interest,
+                total_oi_change, front_month, front_month_settle, front_month_change
+            ) FROM STDIN WITH (FORMAT csv)
+        """, buf)
+        cur.execute("""
+            INSERT INTO bulletin_snapshots (
+                date, symbol, product_name, total_volume, total_open_interest,
+                total_oi_change, front_month, front_month_settle, front_month_change
+            )
+            SELECT date, symbol, product_name, total_volume, total_open_interest,
+                   total_oi_change, front_month, front_month_settle, front_month_change
+            FROM tmp_bulletin_snapshots
+            ON CONFLICT (date, symbol) 
+            DO UPDATE SET
+                product_name = EXCLUDED.product_name,
+                total_volume = EXCLUDED.total_volume,
+                total_open_interest = EXCLUDED.total_open_interest,
+                total_oi_change = EXCLUDED.total_oi_change,
+                front_month = EXCLUDED.front_month,
+                front_month_settle = EXCLUDED.front_month_settle,
+                front_month_change = EXCLUDED.front_month_change,
+                created_at = CURRENT_TIMESTAMP
+        """)
         conn.commit()
         cur.close()
+    except Exception as e:
+        conn.rollback()
+        print(f"[ERROR] Failed to save products: {e}")
+        return False
+    finally:
         conn.close()
+    
+    print(f"[OK] Saved {len(rows)} products to database")
+    return True
+
+
+def index_section62(text: str) -> dict:
+    """Locate every product section in Section 62 text in a single pass.
+    
+    A section runs from the first "SYMBOL FUT PRODUCT_NAME" header to the next
+    "TOTAL SYMBOL FUT" line. Returns {symbol: (body_start, body_end)} offsets
+    into text.
+    """
+    header_ends = {}
+    sections = {}
+    
+    for match in _SECTION62_MARK_RE.finditer(text):
+        header = match.group('header')
+        if header:
+            header_ends.setdefault(header.split(None, 1)[0].upper(), match.end())
+            continue
         
-        print(f"[OK] Saved {saved_count} products to database")
-        
-    except Exception as e:
-        print(f"[ERROR] Database error: {e}")
+        symbol = match.group('total').split(None, 1)[0].upper()
+        if symbol in header_ends and symbol not in sections:
+            sections[symbol] = (header_ends[symbol], match.start())
+    
+    return sections
 
 
 def parse_section62_contracts(text: str) -> dict:
     """Parse contract details from Section 62 PDF text."""
     products = {}
-    
-    # Product symbols to look for
-    product_configs = [
-        ('1OZ', '1 OUNCE GOLD FUTURES', '1OZ FUT'),
-        ('GC', 'COMEX GOLD FUTURES', 'GC FUT'),
-        ('SI', 'COMEX SILVER FUTURES', 'SI FUT'),
-        ('SIL', 'MICRO SILVER FUTURES', 'SIL FUT'),
-        ('HG', 'COMEX COPPER FUTURES', 'HG FUT'),
-        ('PL', 'NYMEX PLATINUM FUTURES', 'PL FUT'),
-        ('PA', 'NYMEX PALLADIUM FUTURES', 'PA FUT'),
-        ('ALI', 'COMEX PHYSICAL ALUMINUM FUTURES', 'ALI FUT'),
-        ('MGC', 'MICRO GOLD FUTURES', 'MGC FUT'),
-        ('MHG', 'COMEX MICRO COPPER FUTURES', 'MHG FUT'),
-        ('QO', 'E-MINI GOLD FUTURES', 'QO FUT'),
-        ('QI', 'E-MINI SILVER FUTURES', 'QI FUT'),
-    ]
-    
-    for symbol, name, section_header in product_configs:
-        # Find the section for this product
-        # Pattern: "SYMBOL FUT PRODUCT_NAME" followed by contract lines until "TOTAL SYMBOL FUT"
-        section_pattern = rf'{re.escape(section_header)}\s+{re.escape(name)}(.*?)TOTAL\s+{re.escape(section_header)}'
-        section_match = re.search(section_pattern, text, re.DOTALL | re.IGNORECASE)
-        
-        if not section_match:
+    sections = index_section62(text)
+    # Candidate TOTAL lines, split out once rather than re-splitting the text per product
+    total_lines = [line for line in text.split('\n') if 'TOTAL' in line]
+    
+    for symbol, name, section_header in _PRODUCT_CONFIGS:
+        # Section for this product: "SYMBOL FUT PRODUCT_NAME" followed by
+        # contract lines until "TOTAL SYMBOL FUT"
+        if symbol not in sections:
             continue
         
-        section = section_match.group(1)
+        section_start, section_end = sections[symbol]
         contracts = []
         
-        # Contract line pattern for Section 62 (pdftotext -layout format):
-        # MONTH   OPEN(or ----)   HIGH/LOW(or ----)   SETTLE [+-] CHANGE   VOLUME(or ----)   PNT(or ----)   OI   [+-] OI_CHANGE(or UNCH)
-        # Example: FEB26                        3007.25             3008.00 /3007.25        3004.00 +   78.75                        3           ----                 5    -       2
-        # Example: NOV26                        ----                ----                    3097.00 +   67.00                     ----           ----               282         UNCH
-
-        contract_pattern = r'([A-Z]{3}\d{2})\s+(?:[\d.]+[BA]?|----)\s+(?:[\d.]+[BA]?\s*/[\d.]+[BA]?|----)\s+([\d.]+)\s+([+-])\s+([\d.]+)\s+([\d]+|----)\s+([\d]+|----)\s+([\d]+)\s+(?:([+-])\s*(\d+)|UNCH)'
-
-        for match in re.finditer(contract_pattern, section):
+        for match in _SECTION62_CONTRACT_RE.finditer(text, section_start, section_end):
             try:
                 month = match.group(1)
                 settle = float(match.group(2))
@@ -564,8 +535,9 @@ def parse_section62_contracts(text: str) -> dict:
             except (ValueError, IndexError):
                 continue
         
-        # Sort by volume descending (front month usually has most volume)
-        contracts.sort(key=lambda x: x['globex_volume'], reverse=True)
+        # Top 10 by volume descending (front month usually has most volume);
+        # same order as a stable sort, without sorting the whole list
+        contracts = heapq.nlargest(10, contracts, key=_BY_VOLUME)
         
         # Get totals from TOTAL line
         # Format: TOTAL SYMBOL FUT   VOLUME   [PNT_VOL]   OI   [+-] OI_CHANGE
@@ -575,10 +547,9 @@ def parse_section62_contracts(text: str) -> dict:
         total_volume = 0
         total_oi_change = 0
 
-        total_pattern = rf'TOTAL\s+{re.escape(section_header)}\s+(\d+).*?(\d+)\s+([+-])\s*(\d+)'
-        for line in text.split('\n'):
-            if 'TOTAL' in line and section_header in line:
-                total_match = re.search(total_pattern, line, re.IGNORECASE)
+        for line in total_lines:
+            if section_header in line:
+                total_match = _SECTION62_TOTAL_RES[symbol].search(line)
                 if total_match:
                     total_volume = int(total_match.group(1))
                     total_oi = int(total_match.group(2))
@@ -591,7 +562,7 @@ def parse_section62_contracts(text: str) -> dict:
             products[symbol] = {
                 'symbol': symbol,
                 'name': name,
-                'contracts': contracts[:10],  # Top 10 contracts by volume
+                'contracts': contracts,
                 'total_volume': total_volume,
                 'total_open_interest': total_oi,
                 'total_oi_change': total_oi_change,
@@ -600,6 +571,25 @@ def parse_section62_contracts(text: str) -> dict:
     return products
 
 
+def file_hash(path: Path) -> str:
+    """Content hash of a file, used to detect unchanged bulletin PDFs."""
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def write_json(path, data) -> None:
+    """
+    Write ``data`` as 2-space indented UTF-8 JSON.
+    
+    The JSON goes to a temporary file beside ``path`` that then replaces
+    it, so the dashboard never reads a half-written file.
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data, default=str,
+                             option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+    os.replace(tmp_path, path)
+
+
 def main():
     print("=" * 70)
     print("  CME Group Daily Bulletin Parser")
@@ -608,6 +598,7 @@ def main():
     
     # Load environment
     load_env()
+    database_url = os.getenv('DATABASE_URL')
     
     # Get paths
     script_dir = Path(__file__).parent
@@ -618,10 +609,38 @@ def main():
     section62_path = project_root / 'data' / 'Section62_Metals_Futures_Products.pdf'
     section02b_path = project_root / 'data' / 'Section02B_Summary_Volume_And_Open_Interest_Metals_Futures_And_Options.pdf'
     
+    # Cron reruns usually see the same PDFs; skip everything if the last
+    # successful run already processed exactly these files and synced them
+    # to the database, or there is still no database (--force to redo)
+    source_hashes = {
+        name: file_hash(path)
+        for name, path in (('section62', section62_path), ('section02b', section02b_path))
+        if path.exists()
+    }
+    if source_hashes and output_file.exists() and '--force' not in sys.argv[1:]:
+        try:
+            previous = orjson.loads(output_file.read_bytes())
+            previous_hashes = previous.get('source_hashes')
+            previous_synced = previous.get('database_synced', False)
+        except (OSError, ValueError, AttributeError):
+            previous_hashes = None
+            previous_synced = False
+        if previous_hashes == source_hashes and (previous_synced or not database_url):
+            print("[INFO] Bulletin PDFs unchanged since last run. Nothing to do.")
+            return
+    
     # Prefer Section 62 for contract details
     if section62_path.exists():
         print(f"[INFO] Parsing Section 62: {section62_path}")
-        text = extract_pdf_text(str(section62_path))
+        # Each extraction is its own pdftotext process, so run the Section 02B
+        # one alongside Section 62 instead of after it
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            text_future = pool.submit(extract_pdf_text, str(section62_path))
+            text_02b_future = None
+            if section02b_path.exists():
+                text_02b_future = pool.submit(extract_pdf_text, str(section02b_path))
+            text = text_future.result()
+            text_02b = text_02b_future.result() if text_02b_future else None
         
         # Parse header
         header = parse_bulletin_header(text)
@@ -630,9 +649,8 @@ def main():
         products = parse_section62_contracts(text)
         
         # If Section 02B also exists, use it for more accurate totals
-        if section02b_path.exists():
+        if text_02b is not None:
             print(f"[INFO] Also parsing Section 02B for totals: {section02b_path}")
-            text_02b = extract_pdf_text(str(section02b_path))
             totals = parse_product_totals(text_02b)
             
             # Merge totals into products
@@ -663,23 +681,32 @@ def main():
     print(f"[INFO] Bulletin #{data.get('bulletin_number')} - {data.get('date')}")
     print(f"[INFO] Found {len(data.get('products', []))} products")
     
+    # One write for the whole summary rather than a print per product
+    lines = []
     for product in data.get('products', []):
         contracts_count = len(product.get('contracts', []))
         front = product.get('contracts', [{}])[0] if product.get('contracts') else {}
         settle = front.get('settle', 'N/A')
-        print(f"  {product['symbol']}: Vol={product['total_volume']:,}, OI={product['total_open_interest']:,}, OI Chg={product['total_oi_change']:+,}, Contracts={contracts_count}, Settle={settle}")
-    
-    # Save to JSON
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
-    
-    print(f"\n[OK] Saved bulletin data to {output_file}")
+        lines.append(f"  {product['symbol']}: Vol={product['total_volume']:,}, OI={product['total_open_interest']:,}, OI Chg={product['total_oi_change']:+,}, Contracts={contracts_count}, Settle={settle}")
+    if lines:
+        print('\n'.join(lines))
     
     # Save to database
-    database_url = os.getenv('DATABASE_URL')
+    saved = True
     if database_url:
         print("\n[INFO] Syncing to database...")
-        save_to_database(data, database_url)
+        saved = save_to_database(data, database_url)
+    
+    # Save to JSON; the source hashes are only recorded once the database
+    # is up to date, so a failed sync is retried on the next run. Whether a
+    # sync ran is stored with them, so a run without DATABASE_URL does not
+    # stop a later run that has one from loading these PDFs.
+    if saved:
+        data['source_hashes'] = source_hashes
+        data['database_synced'] = bool(database_url)
+    write_json(output_file, data)
+    
+    print(f"\n[OK] Saved bulletin data to {output_file}")
     
     print("\n" + "=" * 70)
     print("  Done!")
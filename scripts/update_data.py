@@ -4,14 +4,22 @@ and update the Next.js dashboard data.json file and Neon database.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
+import hashlib
 import io
-import json
+import orjson
+import re
+import shutil
 import sys
 import time
 import random
 import os
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import repeat
 from pathlib import Path
 
 # Optional: psycopg2 for direct database connection
@@ -23,6 +31,13 @@ except ImportError:
     HAS_PSYCOPG2 = False
     print("[INFO] psycopg2 not installed. Will use API endpoint for database sync.")
 
+# Optional: python-calamine for fast Excel parsing without pandas
+try:
+    from python_calamine import CalamineWorkbook
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
 # URLs for the warehouse stocks reports
 # Note: URLs are case-sensitive and CME uses inconsistent naming!
 # Gold_Stocks.xls (capital S) vs Silver_stocks.xls (lowercase s)
@@ -36,84 +51,196 @@ URLS = {
     'Lead': 'https://www.cmegroup.com/delivery_reports/Lead_Stocks.xls',
 }
 
-def fetch_excel_file(url, metal_name):
-    """Fetch an Excel file from a URL and return as pandas DataFrame."""
+# Maximum number of reports downloaded at the same time
+MAX_WORKERS = 4
+
+# Page visited once per run to pick up the cookies CME expects
+WARMUP_URL = 'https://www.cmegroup.com/clearing/operations-and-deliveries/nymex-delivery-notices.html'
+
+# More comprehensive browser-like headers
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0',
+    'Referer': WARMUP_URL,
+}
+
+# Signature of XLSX files (a ZIP container)
+XLSX_MAGIC = b'PK\x03\x04'
+
+# Strings pd.read_excel treats as missing values by default
+NA_STRINGS = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null',
+})
+
+# Keywords (matched against upper-cased cell text) that locate the report
+# date, the column header row and the summary rows to skip
+REPORT_DATE_RE = re.compile(r'REPORT DATE|AS OF')
+LOCATION_HEADER_RE = re.compile(r'DEPOSITORY|WAREHOUSE|LOCATION')
+VALUE_HEADER_RE = re.compile(r'REGISTERED|ELIGIBLE|TOTAL')
+SUMMARY_ROW_RE = re.compile(r'TOTAL|SUM|GRAND')
+
+def create_session():
+    """Create the shared HTTP session used for all CME downloads."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    
+    # Keep one pooled connection per concurrent download, and let urllib3
+    # retry connection errors and throttling/server errors with exponential
+    # backoff (honouring Retry-After)
+    retry = Retry(
+        total=3,
+        backoff_factor=2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET'],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS,
+                          max_retries=retry)
+    session.mount('https://', adapter)
+    
+    # First visit the main page to get cookies
     try:
-        print(f"Fetching {metal_name} stocks from {url}...")
-        
-        # Create a session to handle cookies
-        session = requests.Session()
+        session.get(WARMUP_URL, timeout=15)
+    except:
+        pass
+    
+    return session
+
+def download_report(session, url, metal_name, source=None):
+    """
+    Download a report into a BytesIO buffer.
+    
+    ``source`` holds the ETag / Last-Modified CME sent with the previous
+    download and is replayed as a conditional GET. Returns (buffer, source),
+    where the new source also carries a hash of the body; the buffer is
+    None when CME answers 304 Not Modified.
+    """
+    print(f"Fetching {metal_name} stocks from {url}...")
+    
+    headers = {}
+    if source:
+        if source.get('etag'):
+            headers['If-None-Match'] = source['etag']
+        if source.get('last_modified'):
+            headers['If-Modified-Since'] = source['last_modified']
+    
+    # Stream the body once into a single buffer that every parser
+    # attempt rewinds and reads
+    buf = io.BytesIO()
+    with session.get(url, headers=headers, timeout=30, stream=True) as response:
+        if response.status_code == 304:
+            print(f"  [INFO] {metal_name} report unchanged since last run")
+            return None, source
+        response.raise_for_status()
+        response.raw.decode_content = True
+        shutil.copyfileobj(response.raw, buf)
         
-        # More comprehensive browser-like headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0',
-            'Referer': 'https://www.cmegroup.com/clearing/operations-and-deliveries/nymex-delivery-notices.html',
-        }
+        with buf.getbuffer() as view:
+            source = {'hash': hashlib.blake2b(view, digest_size=16).hexdigest()}
+        if response.headers.get('ETag'):
+            source['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            source['last_modified'] = response.headers['Last-Modified']
+    
+    return buf, source
+
+def convert_cell(value):
+    """Convert a python-calamine cell to the value pd.read_excel would give."""
+    if isinstance(value, str):
+        return None if value in NA_STRINGS else value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, date):
+        return pd.Timestamp(value)
+    if isinstance(value, timedelta):
+        return pd.Timedelta(value)
+    return value
+
+def load_rows(buf):
+    """
+    Read the first sheet with python-calamine, skipping the DataFrame.
+    
+    Like pd.read_excel, the first row is taken as the header and dropped,
+    and blank / N/A cells become missing (None).
+    """
+    sheet = CalamineWorkbook.from_filelike(buf).get_sheet_by_index(0)
+    cells = sheet.to_python(skip_empty_area=False)
+    width = len(cells[0]) if cells else 0
+    
+    rows = np.empty((max(len(cells) - 1, 0), width), dtype=object)
+    for i, row in enumerate(cells[1:]):
+        rows[i] = [convert_cell(value) for value in row]
+    return rows
+
+def read_excel_file(buf, metal_name):
+    """Parse a downloaded report buffer and return its cells as a 2-D object array."""
+    try:
+        # Dispatch on the file signature instead of trying every parser
+        with buf.getbuffer() as view:
+            head = bytes(view[:64])
         
-        session.headers.update(headers)
+        # CME sometimes serves an HTML table under the .xls name
+        if head.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'<'):
+            try:
+                buf.seek(0)
+                dfs = pd.read_html(buf)
+                if dfs:
+                    df = dfs[0]
+                    print(f"  [OK] Parsed as HTML table ({len(df)} rows)")
+                    return df.to_numpy(dtype=object)
+            except Exception as e:
+                print(f"  [DEBUG] HTML parsing failed: {e}")
+            print(f"  [ERROR] Could not parse {metal_name} file as HTML")
+            return None
         
-        # First visit the main page to get cookies
-        try:
-            session.get('https://www.cmegroup.com/clearing/operations-and-deliveries/nymex-delivery-notices.html', timeout=15)
-        except:
-            pass
+        # XLSX is a ZIP container; anything else is old-style XLS (OLE2
+        # D0 CF 11 E0, or a bare BIFF stream), which only xlrd reads
+        engine = 'openpyxl' if head.startswith(XLSX_MAGIC) else 'xlrd'
         
-        # Now fetch the actual file
-        response = session.get(url, timeout=30)
-        response.raise_for_status()
+        # calamine (Rust) reads XLS/XLSX/XLSB and is much faster than xlrd/openpyxl
+        if HAS_CALAMINE:
+            try:
+                buf.seek(0)
+                rows = load_rows(buf)
+                print(f"  [OK] Parsed as Excel/calamine ({len(rows)} rows)")
+                return rows
+            except Exception as e0:
+                print(f"  [DEBUG] calamine failed: {e0}")
         
-        # Try reading as Excel file first (most CME files are old-style XLS)
         try:
-            df = pd.read_excel(io.BytesIO(response.content), engine='xlrd')
-            print(f"  [OK] Parsed as Excel/xlrd ({len(df)} rows)")
-            return df
+            buf.seek(0)
+            df = pd.read_excel(buf, engine=engine)
+            print(f"  [OK] Parsed as Excel/{engine} ({len(df)} rows)")
+            return df.to_numpy(dtype=object)
         except Exception as e1:
-            print(f"  [DEBUG] xlrd failed: {e1}")
-            
-            # Try with openpyxl for newer Excel formats
-            try:
-                df = pd.read_excel(io.BytesIO(response.content), engine='openpyxl')
-                print(f"  [OK] Parsed as Excel/openpyxl ({len(df)} rows)")
-                return df
-            except Exception as e2:
-                print(f"  [DEBUG] openpyxl failed: {e2}")
-                
-                # Try parsing as HTML table (CME sometimes serves HTML as .xls)
-                try:
-                    dfs = pd.read_html(io.BytesIO(response.content))
-                    if dfs:
-                        df = dfs[0]
-                        print(f"  [OK] Parsed as HTML table ({len(df)} rows)")
-                        return df
-                except Exception as e3:
-                    print(f"  [DEBUG] HTML parsing failed: {e3}")
-                
-                # Try with calamine engine (supports more formats)
-                try:
-                    df = pd.read_excel(io.BytesIO(response.content), engine='calamine')
-                    print(f"  [OK] Parsed as Excel/calamine ({len(df)} rows)")
-                    return df
-                except Exception as e4:
-                    print(f"  [DEBUG] calamine failed: {e4}")
+            print(f"  [DEBUG] {engine} failed: {e1}")
         
         print(f"  [ERROR] Could not parse {metal_name} file with any method")
         return None
     except Exception as e:
-        print(f"  [ERROR] Error fetching {metal_name}: {e}")
+        print(f"  [ERROR] Error reading {metal_name}: {e}")
         return None
 
-def parse_warehouse_stocks(df, metal_name):
-    """Parse warehouse stocks data from DataFrame."""
+def numeric_column(rows, col):
+    """Return column ``col`` of ``rows`` as floats, with 0 for blank or non-numeric cells."""
+    if col is None:
+        return np.zeros(len(rows))
+    values = pd.to_numeric(pd.Series(rows[:, col], dtype=object), errors='coerce')
+    return values.fillna(0.0).to_numpy(dtype=float)
+
+def parse_warehouse_stocks(rows, metal_name):
+    """Parse warehouse stocks data from a 2-D object array of sheet cells."""
     data = {
         'metal': metal_name,
         'report_date': None,
@@ -126,37 +253,25 @@ def parse_warehouse_stocks(df, metal_name):
         }
     }
     
-    # Reset index to ensure numeric indexing works
-    df = df.reset_index(drop=True)
-    
-    # Get column names as list
-    cols = list(df.columns)
-    
-    # Try to find date information in first 10 rows
-    for i in range(min(10, len(df))):
-        try:
-            row_values = df.iloc[i].values
-            row_str = ' '.join([str(x) for x in row_values if pd.notna(x)])
-            if 'REPORT DATE' in row_str.upper() or 'AS OF' in row_str.upper():
-                for val in row_values:
-                    if pd.notna(val) and str(val) != 'nan':
-                        date_str = str(val)
-                        if '/' in date_str or '-' in date_str:
-                            data['report_date'] = date_str
-                            break
-        except:
-            pass
-    
-    # Find header row with "DEPOSITORY" or "WAREHOUSE"
+    # One pass over the top of the sheet: each row's cells are stringified
+    # and upper-cased once, then checked for the report date (first 10
+    # rows) and for the header row with "DEPOSITORY" or "WAREHOUSE"
     header_row = None
-    for i in range(len(df)):
+    for i, row_values in enumerate(rows):
+        if i >= 10 and header_row is not None:
+            break
         try:
-            row_values = df.iloc[i].values
-            row_str = ' '.join([str(x) for x in row_values if pd.notna(x)])
-            if any(keyword in row_str.upper() for keyword in ['DEPOSITORY', 'WAREHOUSE', 'LOCATION']):
-                if any(keyword in row_str.upper() for keyword in ['REGISTERED', 'ELIGIBLE', 'TOTAL']):
-                    header_row = i
-                    break
+            cells = [str(x) for x in row_values if pd.notna(x)]
+            row_str = ' '.join(cells).upper()
+            
+            if i < 10 and REPORT_DATE_RE.search(row_str):
+                for date_str in cells:
+                    if date_str != 'nan' and ('/' in date_str or '-' in date_str):
+                        data['report_date'] = date_str
+                        break
+            
+            if header_row is None and LOCATION_HEADER_RE.search(row_str) and VALUE_HEADER_RE.search(row_str):
+                header_row = i
         except:
             pass
     
@@ -169,69 +284,38 @@ def parse_warehouse_stocks(df, metal_name):
     registered_col = None
     eligible_col = None
     
-    header_row_values = df.iloc[header_row].values
+    header_row_values = rows[header_row]
     for idx, col_val in enumerate(header_row_values):
         col_str = str(col_val).upper() if pd.notna(col_val) else ''
-        if 'DEPOSITORY' in col_str or 'WAREHOUSE' in col_str or 'LOCATION' in col_str:
+        if LOCATION_HEADER_RE.search(col_str):
             depository_col = idx
         elif 'REGISTERED' in col_str:
             registered_col = idx
         elif 'ELIGIBLE' in col_str:
             eligible_col = idx
     
-    # Parse data rows
-    reg_sum = 0
-    elig_sum = 0
+    # Parse data rows column-wise: coerce the value columns to numbers in one
+    # pass and pick out the depository rows with a boolean mask
+    body = rows[header_row + 1:]
+    names = pd.Series(body[:, depository_col], dtype=object)
+    names = names.where(names.notna(), '').astype(str).str.strip()
+    upper_names = names.str.upper()
     
-    for i in range(header_row + 1, len(df)):
-        try:
-            row_values = df.iloc[i].values
-            
-            # Get depository name
-            depository_name = ''
-            if depository_col < len(row_values):
-                val = row_values[depository_col]
-                if pd.notna(val):
-                    depository_name = str(val).strip()
-            
-            if not depository_name or depository_name.upper() in ['NAN', '', 'TOTAL', 'GRAND TOTAL']:
-                continue
-            
-            # Skip if it's a summary row
-            if any(keyword in depository_name.upper() for keyword in ['TOTAL', 'SUM', 'GRAND']):
-                continue
-            
-            registered = 0
-            eligible = 0
-            
-            if registered_col is not None and registered_col < len(row_values):
-                try:
-                    val = row_values[registered_col]
-                    if pd.notna(val):
-                        registered = float(val)
-                        reg_sum += registered
-                except:
-                    pass
-            
-            if eligible_col is not None and eligible_col < len(row_values):
-                try:
-                    val = row_values[eligible_col]
-                    if pd.notna(val):
-                        eligible = float(val)
-                        elig_sum += eligible
-                except:
-                    pass
-            
-            if registered > 0 or eligible > 0:
-                data['depositories'].append({
-                    'name': depository_name,
-                    'registered': registered,
-                    'eligible': eligible,
-                    'total': registered + eligible
-                })
-        except Exception as e:
-            print(f"  [WARNING] Error parsing row {i}: {e}")
-            continue
+    # Skip blank names and summary rows (TOTAL, SUM, GRAND TOTAL)
+    is_depository = ((names != '') & (upper_names != 'NAN') &
+                     ~upper_names.str.contains(SUMMARY_ROW_RE)).to_numpy()
+    
+    registered = numeric_column(body, registered_col)
+    eligible = numeric_column(body, eligible_col)
+    
+    reg_sum = float(registered[is_depository].sum())
+    elig_sum = float(eligible[is_depository].sum())
+    
+    keep = is_depository & ((registered > 0) | (eligible > 0))
+    data['depositories'] = [
+        {'name': name, 'registered': reg, 'eligible': elig, 'total': reg + elig}
+        for name, reg, elig in zip(names[keep], registered[keep].tolist(), eligible[keep].tolist())
+    ]
     
     data['totals']['registered'] = reg_sum
     data['totals']['eligible'] = elig_sum
@@ -239,48 +323,84 @@ def parse_warehouse_stocks(df, metal_name):
     
     return data
 
-def fetch_all_stocks():
-    """Fetch all warehouse stocks data."""
-    all_data = {}
+def fetch_metal_stocks(session, metal, url, previous=None):
+    """
+    Fetch and parse one metal's report.
     
-    for metal, url in URLS.items():
-        # Add random delay between requests to avoid rate limiting
-        delay = random.uniform(2, 5)
-        print(f"  [INFO] Waiting {delay:.1f}s before next request...")
-        time.sleep(delay)
+    ``previous`` is the metal's entry from the existing data.json. Its
+    saved ETag / Last-Modified make the download conditional, and it is
+    reused when CME reports the file as not modified or sends back the
+    same bytes.
+    """
+    source = previous.get('source') if previous else None
+    
+    # Stagger the workers so they don't hit CME in lockstep
+    time.sleep(random.uniform(0, 2))
+    
+    try:
+        buf, new_source = download_report(session, url, metal, source)
+        if buf is None:
+            return previous
         
-        # Try up to 3 times with increasing delays
-        for attempt in range(3):
-            try:
-                df = fetch_excel_file(url, metal)
-                if df is not None:
-                    parsed = parse_warehouse_stocks(df, metal)
-                    if parsed and (parsed['totals']['total'] > 0 or len(parsed['depositories']) > 0):
-                        all_data[metal] = parsed
-                        print(f"  [OK] Parsed {metal}: {len(parsed['depositories'])} depositories, "
-                              f"Registered: {parsed['totals']['registered']:,.0f}, "
-                              f"Eligible: {parsed['totals']['eligible']:,.0f}")
-                        break
-                    else:
-                        print(f"  [WARNING] No data found for {metal}")
-                        break
-                else:
-                    if attempt < 2:
-                        retry_delay = (attempt + 1) * 5
-                        print(f"  [RETRY] Attempt {attempt + 1} failed, retrying in {retry_delay}s...")
-                        time.sleep(retry_delay)
-                    else:
-                        print(f"  [FAILED] All attempts failed for {metal}")
-            except Exception as e:
-                if attempt < 2:
-                    print(f"  [RETRY] Error: {e}, retrying...")
-                    time.sleep((attempt + 1) * 5)
-                else:
-                    print(f"  [ERROR] Failed to process {metal}: {e}")
-                continue
+        # Same bytes as last time (CME re-served the file without
+        # validators): reuse the previous parse
+        if source and source.get('hash') == new_source['hash']:
+            print(f"  [INFO] {metal} report content unchanged since last run")
+            return {**previous, 'source': new_source}
+        
+        rows = read_excel_file(buf, metal)
+        if rows is None:
+            print(f"  [FAILED] Could not read the {metal} report")
+            return None
+        
+        parsed = parse_warehouse_stocks(rows, metal)
+        if parsed['totals']['total'] > 0 or len(parsed['depositories']) > 0:
+            if new_source:
+                parsed['source'] = new_source
+            print(f"  [OK] Parsed {metal}: {len(parsed['depositories'])} depositories, "
+                  f"Registered: {parsed['totals']['registered']:,.0f}, "
+                  f"Eligible: {parsed['totals']['eligible']:,.0f}")
+            return parsed
+        
+        print(f"  [WARNING] No data found for {metal}")
+        return None
+    except Exception as e:
+        print(f"  [ERROR] Failed to process {metal}: {e}")
+        return None
+
+def fetch_all_stocks(existing_data=None):
+    """Fetch all warehouse stocks data, reusing ``existing_data`` for unchanged reports."""
+    all_data = {}
+    existing_data = existing_data or {}
+    previous = [existing_data.get(metal) for metal in URLS]
+    
+    # One session for the whole run so the cookies and TLS connections
+    # are reused across metals
+    session = create_session()
+    
+    # The downloads are network-bound, so overlap them; MAX_WORKERS keeps
+    # the number of simultaneous requests to CME small.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        results = pool.map(fetch_metal_stocks, repeat(session), URLS.keys(), URLS.values(), previous)
+        for metal, parsed in zip(URLS, results):
+            if parsed is not None:
+                all_data[metal] = parsed
     
     return all_data
 
+def write_json(path, data) -> None:
+    """
+    Write ``data`` as 2-space indented UTF-8 JSON.
+    
+    The JSON goes to a temporary file beside ``path`` that then replaces
+    it, so the dashboard never reads a half-written file.
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data, default=str,
+                             option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+    os.replace(tmp_path, path)
+
 if __name__ == '__main__':
     print("=" * 70)
     print("  CME Group Warehouse & Depository Stocks Fetcher")
@@ -296,14 +416,14 @@ if __name__ == '__main__':
     existing_data = {}
     if data_file.exists():
         try:
-            with open(data_file, 'r') as f:
-                existing_data = json.load(f)
+            existing_data = orjson.loads(data_file.read_bytes())
             print(f"[INFO] Loaded existing data from {data_file}")
         except:
             pass
     
     # Fetch all stocks data
-    data = fetch_all_stocks()
+    # --force re-downloads and re-parses every report
+    data = fetch_all_stocks(None if '--force' in sys.argv[1:] else existing_data)
     
     if not data:
         print("\n[WARNING] No new data fetched.")
@@ -339,8 +459,7 @@ if __name__ == '__main__':
         print(f"  Total: {info['totals']['total']:,.0f}")
     
     # Save data to JSON file
-    with open(data_file, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    write_json(data_file, data)
     
     print(f"\n[OK] Data saved to {data_file}")
     
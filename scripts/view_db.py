@@ -17,11 +17,9 @@ if not DATABASE_URL:
     print("ERROR: DATABASE_URL or POSTGRES_URL not found in .env file")
     exit(1)
 
-def view_tables():
+def view_tables(conn):
     """List all tables in the database."""
-    conn = None
     try:
-        conn = psycopg2.connect(DATABASE_URL)
         cur = conn.cursor()
         
         # List all tables
@@ -44,42 +42,52 @@ def view_tables():
         
         cur.close()
     except psycopg2.Error as e:
+        conn.rollback()
         print(f"[ERROR] Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
 
-def view_warehouse_snapshots(limit=20):
+def view_warehouse_snapshots(conn, limit=20):
     """View warehouse_snapshots table data."""
-    conn = None
     try:
-        conn = psycopg2.connect(DATABASE_URL)
         cur = conn.cursor()
         
-        # Get table structure
+        # Fetch the table structure, recent rows and summary stats in one
+        # round trip; each part comes back as a JSON value
         cur.execute("""
-            SELECT column_name, data_type 
-            FROM information_schema.columns 
-            WHERE table_name = 'warehouse_snapshots'
-            ORDER BY ordinal_position;
-        """)
+            SELECT json_build_object(
+                'columns', (
+                    SELECT json_agg(json_build_array(column_name, data_type) ORDER BY ordinal_position)
+                    FROM information_schema.columns
+                    WHERE table_name = 'warehouse_snapshots'
+                ),
+                'rows', (
+                    SELECT json_agg(json_build_array(date, metal, registered, eligible, total,
+                                                     report_date, activity_date)
+                                    ORDER BY date DESC, metal)
+                    FROM (
+                        SELECT date, metal, registered, eligible, total, report_date, activity_date
+                        FROM warehouse_snapshots
+                        ORDER BY date DESC, metal
+                        LIMIT %s
+                    ) recent
+                ),
+                'stats', (
+                    SELECT json_build_array(COUNT(DISTINCT date), COUNT(*), MIN(date), MAX(date))
+                    FROM warehouse_snapshots
+                )
+            );
+        """, (limit,))
+        
+        result = cur.fetchone()[0]
+        columns = result['columns'] or []
+        rows = result['rows'] or []
+        stats = result['stats']
         
-        columns = cur.fetchall()
         print("\n" + "=" * 70)
         print("  Table Structure: warehouse_snapshots")
         print("=" * 70)
         for col in columns:
             print(f"  • {col[0]}: {col[1]}")
         
-        # Get data
-        cur.execute(f"""
-            SELECT date, metal, registered, eligible, total, report_date, activity_date
-            FROM warehouse_snapshots
-            ORDER BY date DESC, metal
-            LIMIT {limit};
-        """)
-        
-        rows = cur.fetchall()
         print("\n" + "=" * 70)
         print(f"  Recent Data (showing {len(rows)} rows)")
         print("=" * 70)
@@ -90,17 +98,6 @@ def view_warehouse_snapshots(limit=20):
         else:
             print("  No data found")
         
-        # Get summary stats
-        cur.execute("""
-            SELECT 
-                COUNT(DISTINCT date) as unique_dates,
-                COUNT(*) as total_records,
-                MIN(date) as earliest_date,
-                MAX(date) as latest_date
-            FROM warehouse_snapshots;
-        """)
-        
-        stats = cur.fetchone()
         print("\n" + "=" * 70)
         print("  Summary Statistics")
         print("=" * 70)
@@ -111,18 +108,26 @@ def view_warehouse_snapshots(limit=20):
         
         cur.close()
     except psycopg2.Error as e:
+        conn.rollback()
         print(f"[ERROR] Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 if __name__ == '__main__':
     print("=" * 70)
     print("  Neon Database Viewer")
     print("=" * 70)
     
-    view_tables()
-    view_warehouse_snapshots()
+    # One connection for every view; each connect is a full TLS + auth
+    # handshake with Neon
+    conn = None
+    try:
+        conn = psycopg2.connect(DATABASE_URL)
+        view_tables(conn)
+        view_warehouse_snapshots(conn)
+    except psycopg2.Error as e:
+        print(f"[ERROR] Database error: {e}")
+    finally:
+        if conn:
+            conn.close()
     
     print("\n" + "=" * 70)
     print("  Done!")